@@ -3,12 +3,18 @@ Performance analytics module.
 Provides statistics and reporting on trading performance.
 """
 import logging
+import time
+import numpy as np
 from typing import Dict, Any, List
 from datetime import date, datetime, timedelta
 from database import Database
 
 logger = logging.getLogger(__name__)
 
+# Reporting callers refresh frequently; summaries only change when a
+# trade closes, so short-lived caching is safe
+SUMMARY_CACHE_TTL_SECONDS = 60
+
 
 class Analytics:
     """Handles performance analytics and reporting."""
@@ -16,9 +22,25 @@ class Analytics:
     def __init__(self, database: Database):
         """Initialize analytics."""
         self.db = database
+        # Cache keyed by (days, id of last closed trade)
+        self._summary_cache: Dict[tuple, tuple] = {}
+        # Materialized equity curve, refreshed once per calendar day
+        self._equity_cache: Dict[str, Any] = {}
 
     def get_performance_summary(self, days: int = 30) -> Dict[str, Any]:
         """Get comprehensive performance summary for the last N days."""
+        # Cheap indexed lookup to detect whether anything changed
+        with self.db.get_connection() as conn:
+            row = conn.execute(
+                "SELECT MAX(id) as max_id FROM trades WHERE status = 'closed'"
+            ).fetchone()
+            last_closed_id = row['max_id'] if row else None
+
+        cache_key = (days, last_closed_id)
+        cached = self._summary_cache.get(cache_key)
+        if cached and time.time() - cached[0] < SUMMARY_CACHE_TTL_SECONDS:
+            return dict(cached[1])
+
         stats = self.db.get_trade_statistics(days)
 
         if not stats or stats.get('total_trades', 0) == 0:
@@ -33,20 +55,12 @@ class Analytics:
             if stats['total_trades'] > 0 else 0
         )
 
-        # Calculate profit factor
-        winning_pnl = 0
-        losing_pnl = 0
+        # Profit factor from the gross sums computed in the same SQL pass
+        gross_profit = stats.get('gross_profit') or 0
+        gross_loss = stats.get('gross_loss') or 0
+        profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else 0
 
-        # We'd need to query this separately, simplified here
-        profit_factor = 0
-        if stats['winning_trades'] > 0 and stats['losing_trades'] > 0:
-            # Rough estimate
-            avg_win = stats['max_win'] if stats['max_win'] else 0
-            avg_loss = abs(stats['max_loss']) if stats['max_loss'] else 0
-            if avg_loss > 0:
-                profit_factor = avg_win / avg_loss
-
-        return {
+        summary = {
             'period_days': days,
             'total_trades': stats['total_trades'],
             'winning_trades': stats['winning_trades'],
@@ -60,23 +74,26 @@ class Analytics:
             'profit_factor': profit_factor
         }
 
+        self._summary_cache[cache_key] = (time.time(), dict(summary))
+        return summary
+
     def get_daily_summary(self, target_date: str) -> Dict[str, Any]:
         """Get summary for a specific date."""
-        total_pnl = self.db.get_daily_pnl(target_date)
-
-        # Get trades for that day
+        # Single aggregate query instead of separate pnl and count queries
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT COUNT(*) as count,
+                SELECT COALESCE(SUM(pnl), 0) as total_pnl,
+                       COUNT(*) as count,
                        SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as wins
                 FROM trades
                 WHERE DATE(exit_time) = ? AND status = 'closed'
             """, (target_date,))
             result = cursor.fetchone()
 
+            total_pnl = result['total_pnl'] if result else 0.0
             num_trades = result['count'] if result else 0
-            wins = result['wins'] if result else 0
+            wins = (result['wins'] or 0) if result else 0
 
         win_rate = (wins / num_trades * 100) if num_trades > 0 else 0
 
@@ -91,43 +108,67 @@ class Analytics:
 
     def get_equity_curve(self, days: int = 30) -> List[Dict[str, Any]]:
         """Get equity curve data for the last N days."""
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT date, ending_balance, pnl, pnl_percent
-                FROM daily_performance
-                WHERE date >= date('now', '-' || ? || ' days')
-                ORDER BY date ASC
-            """, (days,))
-
-            return [dict(row) for row in cursor.fetchall()]
+        # daily_performance changes at most once per trading day, so
+        # materialize a wide window once and slice it for smaller requests
+        today = date.today()
+        window = max(days, 365)
+
+        if (self._equity_cache.get('asof') != today
+                or self._equity_cache.get('window', 0) < days):
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT date, ending_balance, pnl, pnl_percent
+                    FROM daily_performance
+                    WHERE date >= date('now', '-' || ? || ' days')
+                    ORDER BY date ASC
+                """, (window,))
+
+                self._equity_cache = {
+                    'asof': today,
+                    'window': window,
+                    'rows': [dict(row) for row in cursor.fetchall()]
+                }
+
+        cutoff = (today - timedelta(days=days)).isoformat()
+        return [dict(row) for row in self._equity_cache['rows']
+                if row['date'] >= cutoff]
 
     def get_best_and_worst_trades(self, limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
         """Get best and worst performing trades."""
+        # Both halves in one round-trip; each LIMIT-bounded subquery is an
+        # index scan on (status, pnl) that stops after `limit` rows
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-
-            # Best trades
             cursor.execute("""
-                SELECT ticker, entry_time, exit_time, entry_price, exit_price,
-                       pnl, pnl_percent
-                FROM trades
-                WHERE status = 'closed'
-                ORDER BY pnl DESC
-                LIMIT ?
-            """, (limit,))
-            best = [dict(row) for row in cursor.fetchall()]
+                SELECT 'best' as side, * FROM (
+                    SELECT ticker, entry_time, exit_time, entry_price, exit_price,
+                           pnl, pnl_percent
+                    FROM trades
+                    WHERE status = 'closed'
+                    ORDER BY pnl DESC
+                    LIMIT ?
+                )
+                UNION ALL
+                SELECT 'worst' as side, * FROM (
+                    SELECT ticker, entry_time, exit_time, entry_price, exit_price,
+                           pnl, pnl_percent
+                    FROM trades
+                    WHERE status = 'closed'
+                    ORDER BY pnl ASC
+                    LIMIT ?
+                )
+            """, (limit, limit))
 
-            # Worst trades
-            cursor.execute("""
-                SELECT ticker, entry_time, exit_time, entry_price, exit_price,
-                       pnl, pnl_percent
-                FROM trades
-                WHERE status = 'closed'
-                ORDER BY pnl ASC
-                LIMIT ?
-            """, (limit,))
-            worst = [dict(row) for row in cursor.fetchall()]
+            best = []
+            worst = []
+            for row in cursor.fetchall():
+                row_dict = dict(row)
+                side = row_dict.pop('side')
+                if side == 'best':
+                    best.append(row_dict)
+                else:
+                    worst.append(row_dict)
 
         return {'best': best, 'worst': worst}
 
@@ -149,16 +190,36 @@ class Analytics:
                 ORDER BY total_pnl DESC
             """)
 
-            results = []
-            for row in cursor.fetchall():
-                row_dict = dict(row)
-                row_dict['win_rate'] = (
-                    (row_dict['wins'] / row_dict['num_trades'] * 100)
-                    if row_dict['num_trades'] > 0 else 0
-                )
-                results.append(row_dict)
+            rows = cursor.fetchall()
+            if not rows:
+                return []
+
+            # Vectorize the win-rate division across all tickers at once
+            columns = rows[0].keys()
+            num_trades = np.array([row['num_trades'] for row in rows], dtype=float)
+            wins = np.array([row['wins'] for row in rows], dtype=float)
+            win_rates = np.where(num_trades > 0, wins / num_trades * 100, 0.0)
+
+            return [
+                {**dict(zip(columns, row)), 'win_rate': float(win_rate)}
+                for row, win_rate in zip(rows, win_rates)
+            ]
 
-            return results
+    def get_dashboard_snapshot(self, days: int = 30, limit: int = 10,
+                               top_limit: int = 3) -> Dict[str, Any]:
+        """
+        Collect everything the analytics dashboard shows in one call.
+        Database keeps one persistent connection per thread, so all five
+        SELECTs here run back-to-back on the same open connection and
+        share its page cache instead of paying per-call setup.
+        """
+        return {
+            'summary': self.get_performance_summary(days),
+            'best_worst': self.get_best_and_worst_trades(limit=top_limit),
+            'ticker_perf': self.get_ticker_performance(),
+            'monthly': self.get_monthly_summary(),
+            'recent': self.db.get_all_trades(limit=limit)
+        }
 
     def format_summary_report(self, days: int = 30) -> str:
         """Generate a formatted text report of performance."""
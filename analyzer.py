@@ -7,9 +7,14 @@ Data Sources:
 - yfinance: Historical earnings dates and price history for pattern analysis
 """
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from typing import List, Optional, Dict, Any
 import finnhub
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import date, timedelta
 import time
@@ -18,6 +23,45 @@ from config import AnalysisConfig, TRADABLE_STOCKS
 
 logger = logging.getLogger(__name__)
 
+# Fundamental metrics change slowly; cache Finnhub results for 6 hours
+FUNDAMENTALS_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Stay safely under Finnhub's 30 requests/second limit
+FINNHUB_REQUESTS_PER_SECOND = 25.0
+
+# Disk cache for yfinance downloads, keyed per ticker and calendar day
+YFINANCE_CACHE_DIR = '.cache'
+
+
+class TokenBucket:
+    """Thread-safe token bucket that only blocks when the rate is saturated."""
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize bucket refilling at `rate` tokens/s up to `capacity`."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) * self.rate
+                )
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 
 class StockAnalyzer:
     """Handles stock analysis and earnings calendar operations."""
@@ -26,6 +70,34 @@ class StockAnalyzer:
         """Initialize stock analyzer."""
         self.finnhub_client = finnhub_client
         self.config = analysis_config
+        # TTL cache for get_fundamental_metrics, keyed by upper-cased ticker
+        self._fundamentals_cache: Dict[str, tuple] = {}
+        self._fundamentals_lock = threading.Lock()
+        # Shared across analysis threads; only blocks near the quota
+        self._rate_limiter = TokenBucket(
+            rate=FINNHUB_REQUESTS_PER_SECOND,
+            capacity=FINNHUB_REQUESTS_PER_SECOND
+        )
+        # History cutoff, computed once per find_best_stock run
+        self._cutoff_date: Optional[pd.Timestamp] = None
+
+    def _load_cached_frame(self, name: str) -> Optional[pd.DataFrame]:
+        """Load a cached DataFrame from disk, or None if absent/unreadable."""
+        path = os.path.join(YFINANCE_CACHE_DIR, name)
+        if os.path.exists(path):
+            try:
+                return pd.read_pickle(path)
+            except Exception as e:
+                logger.debug(f"Could not read cache file {path}: {e}")
+        return None
+
+    def _store_cached_frame(self, name: str, frame: pd.DataFrame) -> None:
+        """Persist a DataFrame to the disk cache (best effort)."""
+        try:
+            os.makedirs(YFINANCE_CACHE_DIR, exist_ok=True)
+            frame.to_pickle(os.path.join(YFINANCE_CACHE_DIR, name))
+        except Exception as e:
+            logger.debug(f"Could not write cache file {name}: {e}")
 
     def get_tomorrows_earnings(self) -> List[str]:
         """
@@ -34,28 +106,35 @@ class StockAnalyzer:
         """
         today = date.today()
 
-        # Look ahead up to 7 days to find next earnings date
-        for i in range(1, 8):
-            check_date = today + timedelta(days=i)
-            check_date_str = check_date.strftime("%Y-%m-%d")
+        # Fetch the whole 7-day window in one request, then pick the
+        # earliest date with events client-side (one round-trip instead
+        # of up to seven).
+        from_str = (today + timedelta(days=1)).strftime("%Y-%m-%d")
+        to_str = (today + timedelta(days=7)).strftime("%Y-%m-%d")
 
-            try:
-                earnings = self.finnhub_client.earnings_calendar(
-                    _from=check_date_str,
-                    to=check_date_str,
-                    international=False
-                )
+        try:
+            earnings = self.finnhub_client.earnings_calendar(
+                _from=from_str,
+                to=to_str,
+                international=False
+            )
 
-                if earnings and earnings.get('earningsCalendar'):
-                    tickers = [event['symbol'] for event in earnings['earningsCalendar']]
-                    logger.info(
-                        f"Found {len(tickers)} stocks reporting earnings on {check_date_str}"
-                    )
-                    return tickers
+            events_by_date: Dict[str, List[str]] = {}
+            if earnings and earnings.get('earningsCalendar'):
+                for event in earnings['earningsCalendar']:
+                    if event.get('symbol') and event.get('date'):
+                        events_by_date.setdefault(event['date'], []).append(event['symbol'])
 
-            except Exception as e:
-                logger.warning(f"Finnhub API error for {check_date_str}: {e}")
-                time.sleep(1)
+            if events_by_date:
+                next_date = min(events_by_date)
+                tickers = events_by_date[next_date]
+                logger.info(
+                    f"Found {len(tickers)} stocks reporting earnings on {next_date}"
+                )
+                return tickers
+
+        except Exception as e:
+            logger.warning(f"Finnhub API error for {from_str}..{to_str}: {e}")
 
         logger.info("No earnings found in the next 7 days")
         return []
@@ -67,7 +146,9 @@ class StockAnalyzer:
         """
         try:
             # First filter by our curated TRADABLE_STOCKS list from stocks.txt
-            filtered = [ticker for ticker in tickers if ticker in TRADABLE_STOCKS]
+            # (frozenset membership; upper-cased so Finnhub casing can't
+            # silently drop real tickers)
+            filtered = [ticker for ticker in tickers if ticker.upper() in TRADABLE_STOCKS]
 
             logger.info(
                 f"Filtered {len(tickers)} tickers to {len(filtered)} in TRADABLE_STOCKS"
@@ -95,48 +176,66 @@ class StockAnalyzer:
             'revenue_growth_trend': 0.5,
             'analyst_score': 0.5
         }
-        
+
         if not self.finnhub_client:
             logger.debug(f"Finnhub client not available for {ticker}")
             return metrics
-        
+
+        # Serve from cache if fetched recently (skips 3 rate-limited calls)
+        cache_key = ticker.upper()
+        with self._fundamentals_lock:
+            cached = self._fundamentals_cache.get(cache_key)
+            if cached and time.time() - cached[0] < FUNDAMENTALS_CACHE_TTL_SECONDS:
+                logger.debug(f"Using cached fundamentals for {ticker}")
+                return dict(cached[1])
+
         try:
-            # 1. Get company earnings (EPS data) from Finnhub
+            def fetch(api_call, *args, **kwargs):
+                self._rate_limiter.acquire()
+                return api_call(*args, **kwargs)
+
+            # The three Finnhub endpoints are independent; fire them
+            # concurrently and collapse 3x(RTT) into max(RTT)
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                earnings_future = executor.submit(
+                    fetch, self.finnhub_client.company_earnings, ticker, limit=8
+                )
+                financials_future = executor.submit(
+                    fetch, self.finnhub_client.company_basic_financials, ticker, 'all'
+                )
+                recommendations_future = executor.submit(
+                    fetch, self.finnhub_client.recommendation_trends, ticker
+                )
+
+            # 1. Company earnings (EPS data)
             try:
-                time.sleep(0.25)  # Rate limiting
-                earnings = self.finnhub_client.company_earnings(ticker, limit=8)
-                
+                earnings = earnings_future.result()
+
                 if earnings and len(earnings) > 0:
-                    beats = 0
-                    surprises = []
-                    
-                    for earning in earnings:
-                        actual = earning.get('actual')
-                        estimate = earning.get('estimate')
-                        
-                        if actual is not None and estimate is not None and estimate != 0:
-                            # Check if beat estimate
-                            if actual > estimate:
-                                beats += 1
-                            
-                            # Calculate surprise percentage
-                            surprise_pct = ((actual - estimate) / abs(estimate)) * 100
-                            surprises.append(surprise_pct)
-                    
-                    if len(earnings) > 0:
-                        metrics['eps_beat_rate'] = beats / len(earnings)
-                    
-                    if surprises:
-                        metrics['avg_eps_surprise_pct'] = sum(surprises) / len(surprises)
-                        
+                    pairs = [
+                        (e['actual'], e['estimate']) for e in earnings
+                        if e.get('actual') is not None
+                        and e.get('estimate') not in (None, 0)
+                    ]
+
+                    if pairs:
+                        actuals = np.array([p[0] for p in pairs], dtype=float)
+                        estimates = np.array([p[1] for p in pairs], dtype=float)
+
+                        metrics['eps_beat_rate'] = (
+                            int((actuals > estimates).sum()) / len(earnings)
+                        )
+
+                        surprises = (actuals - estimates) / np.abs(estimates) * 100
+                        metrics['avg_eps_surprise_pct'] = float(surprises.mean())
+
             except Exception as e:
                 logger.debug(f"Could not fetch earnings for {ticker}: {e}")
             
-            # 2. Get company financials (revenue) from Finnhub
+            # 2. Company financials (revenue)
             try:
-                time.sleep(0.25)  # Rate limiting
-                financials = self.finnhub_client.company_basic_financials(ticker, 'all')
-                
+                financials = financials_future.result()
+
                 if financials and 'series' in financials and 'quarterly' in financials['series']:
                     quarterly = financials['series']['quarterly']
                     
@@ -149,18 +248,22 @@ class StockAnalyzer:
                             revenue_data = sorted(revenue_data, key=lambda x: x['period'], reverse=True)
                             
                             # Calculate growth from last 4 quarters
-                            revenues = [r['v'] for r in revenue_data[:4] if 'v' in r]
-                            
-                            if len(revenues) >= 2:
-                                # Calculate average growth rate
-                                growth_rates = []
-                                for i in range(len(revenues) - 1):
-                                    if revenues[i+1] != 0:
-                                        growth = (revenues[i] - revenues[i+1]) / abs(revenues[i+1])
-                                        growth_rates.append(growth)
-                                
-                                if growth_rates:
-                                    avg_growth = sum(growth_rates) / len(growth_rates)
+                            revenues = np.array(
+                                [r['v'] for r in revenue_data[:4] if 'v' in r],
+                                dtype=float
+                            )
+
+                            if revenues.size >= 2:
+                                # Quarter-over-quarter growth (most recent first)
+                                prev = revenues[1:]
+                                nonzero = prev != 0
+                                growth_rates = (
+                                    (revenues[:-1][nonzero] - prev[nonzero])
+                                    / np.abs(prev[nonzero])
+                                )
+
+                                if growth_rates.size:
+                                    avg_growth = float(growth_rates.mean())
                                     # Normalize: 0% = 0.5, +10% = 0.75, +20%+ = 1.0
                                     if avg_growth > 0:
                                         metrics['revenue_growth_trend'] = min(0.5 + (avg_growth * 2.5), 1.0)
@@ -170,11 +273,10 @@ class StockAnalyzer:
             except Exception as e:
                 logger.debug(f"Could not fetch financials for {ticker}: {e}")
             
-            # 3. Get recommendation trends from Finnhub
+            # 3. Recommendation trends
             try:
-                time.sleep(0.25)  # Rate limiting
-                recommendations = self.finnhub_client.recommendation_trends(ticker)
-                
+                recommendations = recommendations_future.result()
+
                 if recommendations and len(recommendations) > 0:
                     # Use most recent recommendation data
                     recent = recommendations[0]
@@ -202,9 +304,12 @@ class StockAnalyzer:
                         
             except Exception as e:
                 logger.debug(f"Could not fetch recommendations for {ticker}: {e}")
-            
+
+            with self._fundamentals_lock:
+                self._fundamentals_cache[cache_key] = (time.time(), dict(metrics))
+
             return metrics
-            
+
         except Exception as e:
             logger.warning(f"Error fetching fundamentals from Finnhub for {ticker}: {e}")
             return metrics
@@ -224,16 +329,37 @@ class StockAnalyzer:
 
         try:
             stock = yf.Ticker(ticker)
+            today_str = date.today().isoformat()
+
+            # Get earnings dates (served from the daily disk cache when
+            # the pipeline is re-run within the same trading day)
+            earnings_dates = self._load_cached_frame(f"{ticker}_earnings_{today_str}.pkl")
+            if earnings_dates is None:
+                earnings_dates = stock.earnings_dates
+                if earnings_dates is not None and not earnings_dates.empty:
+                    self._store_cached_frame(
+                        f"{ticker}_earnings_{today_str}.pkl", earnings_dates
+                    )
 
-            # Get earnings dates
-            earnings_dates = stock.earnings_dates
             if earnings_dates is None or earnings_dates.empty:
                 logger.info(f"No earnings data for {ticker}")
                 return None
 
-            # Filter to last N years
-            cutoff_date = pd.to_datetime('today') - pd.DateOffset(years=self.config.history_years)
-            relevant_dates = earnings_dates[earnings_dates.index >= cutoff_date].index
+            # Filter to last N years (cutoff hoisted out of the per-ticker
+            # path when running under find_best_stock)
+            cutoff_date = self._cutoff_date
+            if cutoff_date is None:
+                cutoff_date = (
+                    pd.to_datetime('today')
+                    - pd.DateOffset(years=self.config.history_years)
+                )
+            # Binary-search the sorted index instead of building a full
+            # boolean mask over it
+            ed_index = earnings_dates.index
+            if not ed_index.is_monotonic_increasing:
+                ed_index = ed_index.sort_values()
+            start = ed_index.searchsorted(cutoff_date, side='left')
+            relevant_dates = ed_index[start:]
 
             if len(relevant_dates) < 4:
                 logger.info(
@@ -242,53 +368,62 @@ class StockAnalyzer:
                 )
                 return None
 
-            # Get historical price data
-            hist = stock.history(period="5y")
+            # Get historical price data (disk-cached per day as well)
+            hist = self._load_cached_frame(f"{ticker}_history_{today_str}.pkl")
+            if hist is None:
+                hist = stock.history(period="5y")
+                if not hist.empty:
+                    self._store_cached_frame(f"{ticker}_history_{today_str}.pkl", hist)
+
             if hist.empty:
                 logger.info(f"No price history for {ticker}")
                 return None
 
-            # Analyze each earnings event
-            all_gains = []
-            all_drawdowns = []
-
-            for earnings_date in relevant_dates:
-                try:
-                    # Find the closing price on earnings date
-                    t_idx = hist.index.get_loc(earnings_date.normalize(), method='ffill')
-                    t_close = hist.iloc[t_idx]['Close']
-
-                    # Get the next 5 trading days
-                    window = hist.iloc[t_idx + 1 : t_idx + 6]
-                    if window.empty:
-                        continue
-
-                    # Calculate gain (highest high vs earnings close)
-                    perc_gain = (window['High'].max() - t_close) / t_close
-
-                    # Calculate drawdown (lowest low vs earnings close)
-                    perc_drawdown = (window['Low'].min() - t_close) / t_close
-
-                    all_gains.append(perc_gain)
-                    all_drawdowns.append(perc_drawdown)
-
-                except Exception as e:
-                    logger.debug(f"Error analyzing date {earnings_date} for {ticker}: {e}")
-                    continue
-
-            if not all_gains:
+            # Analyze all earnings events in one vectorized pass.
+            # Forward 5-day extremes as flat arrays: value at row i covers
+            # rows i+1..i+5 (reversed rolling handles partial windows near
+            # the end). Computed once, then gathered per earnings date.
+            fwd_high5 = (
+                hist['High'][::-1].rolling(5, min_periods=1).max()[::-1]
+                .shift(-1).to_numpy()
+            )
+            fwd_low5 = (
+                hist['Low'][::-1].rolling(5, min_periods=1).min()[::-1]
+                .shift(-1).to_numpy()
+            )
+            closes = hist['Close'].to_numpy()
+
+            # Map each earnings date to the closing bar on or before it
+            # (O(log n) binary search on the sorted DatetimeIndex)
+            idx = np.searchsorted(
+                hist.index.values,
+                relevant_dates.normalize().values,
+                side='right'
+            ) - 1
+            idx = idx[idx >= 0]
+
+            t_close = closes[idx]
+            gains = (fwd_high5[idx] - t_close) / t_close
+            drawdowns = (fwd_low5[idx] - t_close) / t_close
+
+            # Drop events with no forward window (NaN at the end of history)
+            valid = ~np.isnan(gains)
+            gains = gains[valid]
+            drawdowns = drawdowns[valid]
+
+            if gains.size == 0:
                 logger.info(f"No complete data windows for {ticker}")
                 return None
 
             # Calculate statistics
-            positive_gains = [g for g in all_gains if g > 0.01]  # >1% gain
-            negative_drawdowns = [d for d in all_drawdowns if d < 0]
+            positive_gains = gains[gains > 0.01]  # >1% gain
+            negative_drawdowns = drawdowns[drawdowns < 0]
 
-            frequency = len(positive_gains) / len(all_gains) if all_gains else 0
-            avg_gain = sum(positive_gains) / len(positive_gains) if positive_gains else 0
+            frequency = positive_gains.size / gains.size
+            avg_gain = float(positive_gains.mean()) if positive_gains.size else 0
             avg_drawdown = (
-                sum(negative_drawdowns) / len(negative_drawdowns)
-                if negative_drawdowns else -0.05
+                float(negative_drawdowns.mean())
+                if negative_drawdowns.size else -0.05
             )
 
             # Price pattern score (historical performance)
@@ -359,13 +494,27 @@ class StockAnalyzer:
             )
             tradable = tradable[:self.config.max_stocks_to_analyze]
 
-        # Step 3: Analyze each stock
+        # Compute the history cutoff once for this whole run
+        self._cutoff_date = (
+            pd.to_datetime('today') - pd.DateOffset(years=self.config.history_years)
+        )
+
+        # Step 3: Analyze stocks concurrently (each analysis is I/O-bound
+        # on yfinance/Finnhub, so overlap the network latency)
         results = []
-        for ticker in tradable:
-            analysis = self.analyze_stock_earnings(ticker)
-            if analysis:
-                results.append(analysis)
-            time.sleep(1)  # Rate limiting
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = {
+                executor.submit(self.analyze_stock_earnings, ticker): ticker
+                for ticker in tradable
+            }
+            for future in as_completed(futures):
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    logger.error(f"Error analyzing {futures[future]}: {e}")
+                    continue
+                if analysis:
+                    results.append(analysis)
 
         if not results:
             logger.info("No stocks successfully analyzed")
@@ -392,9 +541,8 @@ class StockAnalyzer:
             f"(EPS beat rate >= 30%)"
         )
 
-        # Step 4: Sort by score and get best
-        quality_results.sort(key=lambda x: x['score'], reverse=True)
-        best = quality_results[0]
+        # Step 4: Pick the highest-scoring candidate (O(N), no sort needed)
+        best = max(quality_results, key=itemgetter('score'))
 
         logger.info(
             f"Best candidate: {best['ticker']} | Score={best['score']:.4f} "
@@ -423,8 +571,22 @@ class StockAnalyzer:
         """Get current stock information including price and volume."""
         try:
             stock = yf.Ticker(ticker)
-            info = stock.info
 
+            try:
+                # fast_info hits a small quote endpoint instead of the
+                # full multi-hundred-KB info payload
+                fast_info = stock.fast_info
+                return {
+                    'ticker': ticker,
+                    'current_price': fast_info.last_price or 0,
+                    'volume': fast_info.last_volume or 0,
+                    'avg_volume': fast_info.three_month_average_volume or 0,
+                    'market_cap': fast_info.market_cap or 0,
+                }
+            except (KeyError, AttributeError) as e:
+                logger.debug(f"fast_info unavailable for {ticker}, falling back: {e}")
+
+            info = stock.info
             return {
                 'ticker': ticker,
                 'current_price': info.get('currentPrice', info.get('regularMarketPrice', 0)),
@@ -4,12 +4,18 @@ Simulates the bot running over a historical period, getting earnings calendars
 and making trades as if it were running in real-time.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta, datetime
 from typing import List, Dict, Any, Optional
+import numpy as np
 import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+from pandas.tseries.offsets import CustomBusinessDay
 import time
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
@@ -17,7 +23,7 @@ from alpaca.data.timeframe import TimeFrame
 
 from config import config, TRADABLE_STOCKS
 from backtester import Backtester
-from analyzer import StockAnalyzer
+from analyzer import StockAnalyzer, TokenBucket
 
 load_dotenv()
 
@@ -29,6 +35,61 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Score weights are constants for a whole run; the fundamental blend is
+# folded into the per-ticker fundamentals cache so the per-day hot path
+# is only the final price/fundamental mix
+EPS_BEAT_WEIGHT = 0.5        # 50% weight on EPS beat rate
+EPS_SURPRISE_WEIGHT = 0.3    # 30% weight on EPS surprise magnitude
+ANALYST_WEIGHT = 0.15        # 15% weight on analyst ratings
+REVENUE_WEIGHT = 0.05        # 5% weight on revenue growth
+PRICE_SCORE_WEIGHT = 0.7
+FUNDAMENTAL_SCORE_WEIGHT = 0.3
+
+
+def _fundamental_score(fundamentals: Dict[str, float]) -> float:
+    """Weighted fundamental blend; EPS surprise normalized -20%=0, 0%=0.5, +20%=1."""
+    normalized_eps_surprise = min(max((fundamentals['avg_eps_surprise_pct'] / 40.0) + 0.5, 0.0), 1.0)
+    return (
+        fundamentals['eps_beat_rate'] * EPS_BEAT_WEIGHT +
+        normalized_eps_surprise * EPS_SURPRISE_WEIGHT +
+        fundamentals['analyst_score'] * ANALYST_WEIGHT +
+        fundamentals['revenue_growth_trend'] * REVENUE_WEIGHT
+    )
+
+
+def _earnings_window_stats(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+                           pos: np.ndarray, window: int = 5,
+                           min_periods: int = 3) -> tuple:
+    """
+    Per-event gain and drawdown over the next `window` sessions.
+
+    Pure-NumPy kernel over contiguous arrays: full forward windows come
+    from one sliding_window_view, partial tail windows (at least
+    `min_periods` future sessions) from at most `window - 1` scalar
+    reductions. Events with too few future sessions yield NaN.
+    """
+    n = len(closes)
+    fwd_high = np.full(n, np.nan)
+    fwd_low = np.full(n, np.nan)
+
+    if n > window:
+        fwd_high[:n - window] = (
+            np.lib.stride_tricks.sliding_window_view(highs[1:], window).max(axis=1)
+        )
+        fwd_low[:n - window] = (
+            np.lib.stride_tricks.sliding_window_view(lows[1:], window).min(axis=1)
+        )
+
+    for i in range(max(0, n - window), n - min_periods):
+        fwd_high[i] = highs[i + 1:].max()
+        fwd_low[i] = lows[i + 1:].min()
+
+    t_close = closes[pos]
+    gains = (fwd_high[pos] - t_close) / t_close
+    drawdowns = (fwd_low[pos] - t_close) / t_close
+    return gains, drawdowns
+
+
 class FullBacktester:
     """Full simulation of bot running over historical period."""
 
@@ -38,7 +99,16 @@ class FullBacktester:
         self.capital = 10000.0
         self.initial_capital = 10000.0
         self.trades = []
-        self.daily_log = []
+
+        # Columnar (SoA) logs, pre-sized in run_full_backtest once the
+        # day count is known; statistics reduce these with NumPy ufuncs
+        # instead of iterating lists of dicts
+        self._log_dates = np.empty(0, dtype=object)
+        self._capital_log = np.empty(0, dtype=np.float64)
+        self._trade_pnl = np.empty(0, dtype=np.float64)
+        self._trade_cash_pnl = np.empty(0, dtype=np.float64)
+        self._num_days = 0
+        self._num_trades = 0
         self.config = config.analysis
         
         # Initialize Alpaca data client (using IEX feed for free tier)
@@ -58,6 +128,162 @@ class FullBacktester:
         # Initialize analyzer for fundamental analysis
         self.analyzer = StockAnalyzer(finnhub_client=None, analysis_config=config.analysis)
 
+        # Persistent HTTP session with connection pooling and retries on
+        # transient errors, plus the per-run earnings-calendar cache
+        # (filled in one range request by prefetch_earnings_calendar)
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+        self._earnings_calendar_cache: Dict[date, List[str]] = {}
+
+        # Pace cache-miss Finnhub calls (free tier: 60 calls/minute);
+        # prefetch-served days never touch this
+        self._finnhub_limiter = TokenBucket(rate=1.0, capacity=5.0)
+
+        # Per-ticker daily bars covering the whole backtest lookback,
+        # downloaded in one multi-symbol request by prefetch_bars and
+        # held as plain arrays (timestamps + the OHLC columns the
+        # analysis reads), skipping per-ticker DataFrame construction
+        self._bars: Dict[str, Dict[str, np.ndarray]] = {}
+
+        # Fundamentals don't change within a backtest run; memoize per
+        # ticker, including the neutral defaults recorded after a fetch
+        # failure so problem tickers aren't retried every simulated day
+        self._fundamentals_cache: Dict[str, Dict[str, float]] = {}
+
+        # Shared pool for per-ticker analysis; each task is independent
+        # and I/O-bound, so network latency overlaps. API pacing is
+        # handled by the analyzer's token-bucket rate limiter.
+        self._pool = ThreadPoolExecutor(max_workers=8)
+
+    @staticmethod
+    def _bars_to_arrays(ticker_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Extract one ticker's slice of an Alpaca `bars.df` as plain arrays."""
+        df = ticker_df.droplevel('symbol') if 'symbol' in ticker_df.index.names else ticker_df
+        # Keep timestamps as datetime64[ns] so comparisons and searchsorted
+        # stay C-level integer ops; float32 is plenty for daily prices and
+        # halves the bandwidth of the vectorized window math
+        index = df.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return {
+            'ts': index.normalize().to_numpy().astype('datetime64[ns]'),
+            'high': df['high'].to_numpy(dtype=np.float32),
+            'low': df['low'].to_numpy(dtype=np.float32),
+            'close': df['close'].to_numpy(dtype=np.float32)
+        }
+
+    def prefetch_bars(self, start_date: date, end_date: date) -> None:
+        """
+        Download daily bars for every ticker on the prefetched earnings
+        calendar in one multi-symbol request, including the two-year
+        lookback analyze_stock_history needs, and cache them per ticker.
+        """
+        tickers = sorted({
+            ticker
+            for day_tickers in self._earnings_calendar_cache.values()
+            for ticker in day_tickers
+        })
+        if not tickers:
+            return
+
+        try:
+            request_params = StockBarsRequest(
+                symbol_or_symbols=tickers,
+                timeframe=TimeFrame.Day,
+                start=start_date - timedelta(days=740),  # lookback + buffer
+                end=end_date,
+                feed='iex'  # Use IEX feed for free tier accounts
+            )
+
+            bars = self.alpaca_data.get_stock_bars(request_params)
+
+            # bars.df is already columnar; split per ticker without any
+            # per-bar Python loop
+            if not bars.df.empty:
+                for ticker, ticker_df in bars.df.groupby(level='symbol'):
+                    self._bars[ticker] = self._bars_to_arrays(ticker_df)
+
+            logger.info(f"Prefetched bars for {len(self._bars)}/{len(tickers)} tickers")
+
+        except Exception as e:
+            logger.warning(f"Bar prefetch error: {e}")
+
+    def _fetch_missing_bars(self, tickers: List[str], upcoming_earnings_date: date) -> None:
+        """Fill bar-cache misses for one day with a single batched request."""
+        try:
+            request_params = StockBarsRequest(
+                symbol_or_symbols=tickers,
+                timeframe=TimeFrame.Day,
+                start=upcoming_earnings_date - timedelta(days=750),
+                end=upcoming_earnings_date - timedelta(days=1),
+                feed='iex'  # Use IEX feed for free tier accounts
+            )
+
+            bars = self.alpaca_data.get_stock_bars(request_params)
+
+            if not bars.df.empty:
+                for ticker, ticker_df in bars.df.groupby(level='symbol'):
+                    self._bars[ticker] = self._bars_to_arrays(ticker_df)
+
+        except Exception as e:
+            logger.debug(f"  Batched bar fetch failed: {e}")
+
+    def prefetch_earnings_calendar(self, start_date: date, end_date: date) -> None:
+        """
+        Fetch the whole backtest period's earnings calendar in one Finnhub
+        range request and cache it as {date: [tickers]}, so the day loop
+        never has to hit the network per simulated day.
+        """
+        api_key = os.getenv('FINNHUB_API_KEY')
+        if not api_key or api_key == 'your_finnhub_api_key_here':
+            return
+
+        try:
+            response = self.http.get(
+                "https://finnhub.io/api/v1/calendar/earnings",
+                params={
+                    'from': start_date.strftime("%Y-%m-%d"),
+                    'to': end_date.strftime("%Y-%m-%d"),
+                    'token': api_key
+                },
+                timeout=30
+            )
+
+            if response.status_code != 200:
+                logger.warning(f"Earnings calendar prefetch failed: {response.status_code}")
+                return
+
+            calendar: Dict[date, List[str]] = {}
+            for event in response.json().get('earningsCalendar', []):
+                symbol = event.get('symbol')
+                event_date_str = event.get('date')
+                if symbol and event_date_str and symbol in TRADABLE_STOCKS:
+                    event_date = datetime.strptime(event_date_str, "%Y-%m-%d").date()
+                    calendar.setdefault(event_date, []).append(symbol)
+
+            # Record every date in range, including empty ones, so cache
+            # hits don't fall through to per-day requests
+            current = start_date
+            while current <= end_date:
+                self._earnings_calendar_cache[current] = calendar.get(current, [])
+                current += timedelta(days=1)
+
+            logger.info(
+                f"Prefetched earnings calendar: {sum(len(v) for v in calendar.values())} "
+                f"tradable events over {start_date}..{end_date}"
+            )
+
+        except Exception as e:
+            logger.warning(f"Earnings calendar prefetch error: {e}")
+
     def analyze_stock_history(self, ticker: str, upcoming_earnings_date: date) -> Optional[Dict[str, Any]]:
         """
         Analyze historical price action around past earnings dates using Alpaca.
@@ -91,110 +317,100 @@ class FullBacktester:
             # Get historical price data from Alpaca (using IEX feed for free tier)
             start_date = cutoff - timedelta(days=10)  # Add buffer
             end_date = upcoming_earnings_date - timedelta(days=1)
-            
-            request_params = StockBarsRequest(
-                symbol_or_symbols=[ticker],
-                timeframe=TimeFrame.Day,
-                start=start_date,
-                end=end_date,
-                feed='iex'  # Use IEX feed for free tier accounts
-            )
-            
-            bars = self.alpaca_data.get_stock_bars(request_params)
-            
-            if ticker not in bars.data or not bars.data[ticker]:
-                logger.debug(f"    No price data from Alpaca")
+
+            # Serve from the prefetched multi-symbol download when possible,
+            # falling back to a per-ticker request for cache misses
+            start_ts = np.datetime64(start_date)
+            end_ts = np.datetime64(end_date)
+
+            arrays = self._bars.get(ticker)
+            if arrays is None:
+                request_params = StockBarsRequest(
+                    symbol_or_symbols=[ticker],
+                    timeframe=TimeFrame.Day,
+                    start=start_date,
+                    end=end_date,
+                    feed='iex'  # Use IEX feed for free tier accounts
+                )
+
+                bars = self.alpaca_data.get_stock_bars(request_params)
+
+                if bars.df.empty or ticker not in bars.df.index.get_level_values('symbol'):
+                    logger.debug(f"    No price data from Alpaca")
+                    return None
+
+                arrays = self._bars_to_arrays(bars.df.xs(ticker, level='symbol'))
+
+            # Slice the analysis window out of the arrays with two binary
+            # searches instead of boolean masks over a DataFrame
+            ts = arrays['ts']
+            lo = int(np.searchsorted(ts, start_ts, side='left'))
+            hi = int(np.searchsorted(ts, end_ts, side='right'))
+
+            if hi <= lo:
+                logger.debug(f"    No price data in range")
                 return None
-            
-            # Convert to DataFrame for easier analysis
-            df = pd.DataFrame([{
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume
-            } for bar in bars.data[ticker]])
-            
-            df['date'] = pd.to_datetime(df['timestamp']).dt.date
-            df = df.set_index('date')
-            
-            # Analyze each estimated earnings date
-            all_gains = []
-            all_drawdowns = []
-            
-            for earnings_est_date in past_earnings_dates:
-                try:
-                    # Find closest trading day to earnings estimate
-                    if earnings_est_date not in df.index:
-                        # Find nearest date
-                        nearest_idx = df.index[df.index >= earnings_est_date][0] if any(df.index >= earnings_est_date) else None
-                        if nearest_idx is None:
-                            continue
-                        earnings_est_date = nearest_idx
-                    
-                    t_close = df.loc[earnings_est_date, 'close']
-                    
-                    # Get next 5 trading days
-                    future_dates = [d for d in df.index if d > earnings_est_date][:5]
-                    if len(future_dates) < 3:  # Need at least 3 days
-                        continue
-                    
-                    window = df.loc[future_dates]
-                    
-                    # Calculate gain and drawdown
-                    perc_gain = (window['high'].max() - t_close) / t_close
-                    perc_drawdown = (window['low'].min() - t_close) / t_close
-                    
-                    all_gains.append(perc_gain)
-                    all_drawdowns.append(perc_drawdown)
-                    
-                except Exception as e:
-                    logger.debug(f"    Error analyzing {earnings_est_date}: {e}")
-                    continue
-            
-            if not all_gains or len(all_gains) < 3:
-                logger.debug(f"    Insufficient data points ({len(all_gains)})")
+
+            ts = ts[lo:hi]
+            highs = arrays['high'][lo:hi]
+            lows = arrays['low'][lo:hi]
+            closes = arrays['close'][lo:hi]
+
+            # Analyze every estimated earnings date in one vectorized pass:
+            # anchor bars via a single searchsorted over the sorted
+            # timestamps, forward 5-day extremes via the module-level
+            # kernel (NaN where fewer than 3 future days exist)
+            dates_arr = np.array(past_earnings_dates, dtype='datetime64[D]').astype('datetime64[ns]')
+            pos = np.searchsorted(ts, dates_arr, side='left')
+            pos = pos[pos < len(closes)]
+
+            gains, drawdowns = _earnings_window_stats(highs, lows, closes, pos)
+
+            valid = ~np.isnan(gains)
+            gains = gains[valid]
+            drawdowns = drawdowns[valid]
+
+            if len(gains) < 3:
+                logger.debug(f"    Insufficient data points ({len(gains)})")
                 return None
-            
-            # Calculate statistics
-            positive_gains = [g for g in all_gains if g > 0.01]  # >1% gain
-            negative_drawdowns = [d for d in all_drawdowns if d < 0]
-            
-            frequency = len(positive_gains) / len(all_gains) if all_gains else 0
-            avg_gain = sum(positive_gains) / len(positive_gains) if positive_gains else 0
-            avg_drawdown = sum(negative_drawdowns) / len(negative_drawdowns) if negative_drawdowns else -0.05
+
+            # Calculate statistics with boolean-mask reductions
+            pos_mask = gains > 0.01  # >1% gain
+            neg_mask = drawdowns < 0
+
+            frequency = float(pos_mask.mean())
+            avg_gain = float(gains[pos_mask].mean()) if pos_mask.any() else 0
+            avg_drawdown = float(drawdowns[neg_mask].mean()) if neg_mask.any() else -0.05
             
             # Price pattern score (historical performance)
             price_score = frequency * avg_gain
             
-            # Get fundamental metrics (with error handling for delisted/problematic stocks)
-            try:
-                fundamentals = self.analyzer.get_fundamental_metrics(ticker)
-            except Exception as e:
-                logger.debug(f"    Could not fetch fundamentals: {e}")
-                # Use neutral defaults if fundamentals fail
-                fundamentals = {
-                    'eps_beat_rate': 0.5,
-                    'avg_eps_surprise_pct': 0.0,
-                    'revenue_growth_trend': 0.5,
-                    'analyst_score': 0.5,
-                    'institutional_ownership_pct': 0.0
-                }
-            
-            # Calculate fundamental score (weighted combination using Finnhub data)
-            # Normalize EPS surprise: -20% = 0, 0% = 0.5, +20% = 1.0
-            normalized_eps_surprise = min(max((fundamentals['avg_eps_surprise_pct'] / 40.0) + 0.5, 0.0), 1.0)
-            
-            fundamental_score = (
-                fundamentals['eps_beat_rate'] * 0.5 +           # 50% weight on EPS beat rate
-                normalized_eps_surprise * 0.3 +                 # 30% weight on EPS surprise magnitude
-                fundamentals['analyst_score'] * 0.15 +          # 15% weight on analyst ratings
-                fundamentals['revenue_growth_trend'] * 0.05     # 5% weight on revenue growth
-            )
-            
+            # Get fundamental metrics (with error handling for delisted/problematic
+            # stocks), memoized per ticker for the whole run
+            fundamentals = self._fundamentals_cache.get(ticker)
+            if fundamentals is None:
+                try:
+                    fundamentals = self.analyzer.get_fundamental_metrics(ticker)
+                except Exception as e:
+                    logger.debug(f"    Could not fetch fundamentals: {e}")
+                    # Use neutral defaults if fundamentals fail
+                    fundamentals = {
+                        'eps_beat_rate': 0.5,
+                        'avg_eps_surprise_pct': 0.0,
+                        'revenue_growth_trend': 0.5,
+                        'analyst_score': 0.5,
+                        'institutional_ownership_pct': 0.0
+                    }
+                # Fold the constant-weight blend into the cache entry so
+                # repeat appearances skip the arithmetic too
+                fundamentals['fundamental_score'] = _fundamental_score(fundamentals)
+                self._fundamentals_cache[ticker] = fundamentals
+
+            fundamental_score = fundamentals['fundamental_score']
+
             # Combined score: 70% price pattern, 30% fundamentals
-            final_score = (price_score * 0.7) + (fundamental_score * 0.3)
+            final_score = (price_score * PRICE_SCORE_WEIGHT
+                           + fundamental_score * FUNDAMENTAL_SCORE_WEIGHT)
             
             # Filter by fundamental quality
             if fundamentals['eps_beat_rate'] < 0.3:
@@ -229,8 +445,12 @@ class FullBacktester:
         Returns:
             List of ticker symbols with earnings on that date
         """
+        # Served from the prefetched range cache on the hot path
+        if target_date in self._earnings_calendar_cache:
+            return self._earnings_calendar_cache[target_date]
+
         api_key = os.getenv('FINNHUB_API_KEY')
-        
+
         if not api_key or api_key == 'your_finnhub_api_key_here':
             logger.warning("⚠️  FINNHUB_API_KEY not configured - using sample data")
             return self._get_sample_earnings(target_date)
@@ -250,23 +470,27 @@ class FullBacktester:
                 'token': api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            
+            # Only cache misses pay the rate-limit wait
+            self._finnhub_limiter.acquire()
+            response = self.http.get(url, params=params, timeout=10)
+
             if response.status_code == 200:
                 data = response.json()
                 earnings_calendar = data.get('earningsCalendar', [])
-                
+
                 if earnings_calendar:
                     # Extract symbols and filter to whitelist
                     all_tickers = [event.get('symbol') for event in earnings_calendar if event.get('symbol')]
-                    
+
                     # Filter to our tradable stocks
                     filtered_tickers = [t for t in all_tickers if t in TRADABLE_STOCKS]
-                    
+
                     logger.debug(f"  Found {len(all_tickers)} total, {len(filtered_tickers)} tradable")
+                    self._earnings_calendar_cache[target_date] = filtered_tickers
                     return filtered_tickers
                 else:
                     logger.debug(f"  No earnings found")
+                    self._earnings_calendar_cache[target_date] = []
                     return []
             elif response.status_code == 429:
                 logger.warning("  Rate limit hit - waiting...")
@@ -309,11 +533,6 @@ class FullBacktester:
         logger.info(f"Capital: ${self.capital:,.2f} | Trades: {len(self.trades)}")
         logger.info("-" * 60)
 
-        # Check if market was open (skip weekends)
-        if current_date.weekday() >= 5:  # Saturday = 5, Sunday = 6
-            logger.info("⏭️  Weekend - Skipped")
-            return None
-
         # Get stocks with earnings tomorrow
         next_day = current_date + timedelta(days=1)
         earnings_stocks = self.get_historical_earnings_calendar(next_day)
@@ -327,19 +546,29 @@ class FullBacktester:
         # Analyze top stocks (using configured max from config)
         max_analyze = min(len(earnings_stocks), self.config.max_stocks_to_analyze)
         logger.info(f"📈 Analyzing up to {max_analyze} stocks...")
-        analyzed_stocks = []
 
-        for ticker in earnings_stocks[:max_analyze]:
-            analysis = self.analyze_stock_history(ticker, next_day)
-            if analysis:
-                analyzed_stocks.append(analysis)
+        # One batched request for any tickers the prefetch didn't cover,
+        # instead of a per-ticker request inside each analysis
+        candidates = earnings_stocks[:max_analyze]
+        missing = [t for t in candidates if t not in self._bars]
+        if missing:
+            self._fetch_missing_bars(missing, next_day)
+
+        # Fan the independent, I/O-bound analyses out over the thread pool
+        results = self._pool.map(
+            lambda ticker: self.analyze_stock_history(ticker, next_day),
+            candidates
+        )
+        analyzed_stocks = [analysis for analysis in results if analysis]
 
         if not analyzed_stocks:
             logger.info("❌ No qualifying stocks - Skipped")
             return None
 
-        # Select best stock
-        best_stock = max(analyzed_stocks, key=lambda x: x['score'])
+        # Select best stock via a single argmax over the scores
+        scores = np.fromiter((a['score'] for a in analyzed_stocks),
+                             dtype=float, count=len(analyzed_stocks))
+        best_stock = analyzed_stocks[int(scores.argmax())]
         
         # Check minimum thresholds
         if best_stock['frequency'] < 0.4 or best_stock['avg_gain'] < 0.01:
@@ -386,8 +615,11 @@ class FullBacktester:
             
             result_emoji = "🟢" if trade_pnl > 0 else "🔴"
             logger.info(f"{result_emoji} {trade_result['exit_reason']} | P&L: ${trade_pnl:+,.2f} ({trade_result['pnl_percent']:+.2f}%)")
-            
+
             self.trades.append(trade_result)
+            self._trade_pnl[self._num_trades] = trade_result['pnl']
+            self._trade_cash_pnl[self._num_trades] = trade_pnl
+            self._num_trades += 1
             return trade_result
         else:
             logger.info("❌ Trade simulation failed")
@@ -405,13 +637,20 @@ class FullBacktester:
         """
         end_date = date.today()
         start_date = end_date - timedelta(weeks=weeks)
-        total_days = (end_date - start_date).days + 1
-        
+
+        # Only simulate US trading days; weekends and federal holidays
+        # never produce trades
+        trading_days = pd.date_range(
+            start_date, end_date,
+            freq=CustomBusinessDay(calendar=USFederalHolidayCalendar())
+        )
+        total_days = len(trading_days)
+
         print(f"\n{'='*60}")
         print(f"🚀 FULL BACKTEST - {weeks} Weeks")
         print(f"{'='*60}")
         print(f"Period:          {start_date} to {end_date}")
-        print(f"Total Days:      {total_days}")
+        print(f"Trading Days:    {total_days}")
         print(f"Initial Capital: ${self.initial_capital:,.2f}")
         print(f"Position Size:   85% of capital")
         print(f"Max Hold:        5 days")
@@ -423,23 +662,31 @@ class FullBacktester:
             print(f"Data Source:     Sample Data (Add FINNHUB_API_KEY for real data)")
         
         print(f"{'='*60}\n")
-        
-        # Simulate each day
-        current_date = start_date
-        day_num = 1
-        
-        while current_date <= end_date:
-            self.daily_log.append({
-                'date': current_date,
-                'capital': self.capital
-            })
-            
+
+        # One range request covers every simulated day (earnings are
+        # checked for current_date + 1, hence the extra day)
+        self.prefetch_earnings_calendar(start_date, end_date + timedelta(days=1))
+
+        # Batch-download bars for every ticker on the calendar up front
+        self.prefetch_bars(start_date, end_date + timedelta(days=1))
+
+        # Pre-size the columnar logs now that the day count is known
+        # (at most one trade per day)
+        self._log_dates = np.empty(total_days, dtype=object)
+        self._capital_log = np.empty(total_days, dtype=np.float64)
+        self._trade_pnl = np.empty(total_days, dtype=np.float64)
+        self._trade_cash_pnl = np.empty(total_days, dtype=np.float64)
+        self._num_days = 0
+        self._num_trades = 0
+
+        # Simulate each trading day
+        for day_num, timestamp in enumerate(trading_days, start=1):
+            current_date = timestamp.date()
+            self._log_dates[self._num_days] = current_date
+            self._capital_log[self._num_days] = self.capital
+            self._num_days += 1
+
             self.simulate_day(current_date, day_num, total_days)
-            current_date += timedelta(days=1)
-            day_num += 1
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.1)
 
         # Calculate final statistics
         return self.calculate_statistics()
@@ -456,23 +703,27 @@ class FullBacktester:
         total_pnl = self.capital - self.initial_capital
         total_pnl_pct = (total_pnl / self.initial_capital) * 100
 
-        wins = [t for t in self.trades if t['pnl'] > 0]
-        losses = [t for t in self.trades if t['pnl'] <= 0]
+        pnl = self._trade_pnl[:self._num_trades]
+        cash_pnl = self._trade_cash_pnl[:self._num_trades]
+        win_mask = pnl > 0
+
+        num_wins = int(win_mask.sum())
+        num_losses = len(pnl) - num_wins
 
-        win_rate = (len(wins) / len(self.trades)) * 100 if self.trades else 0
+        win_rate = float(win_mask.mean()) * 100 if len(pnl) else 0
 
-        avg_win = sum(t['trade_pnl'] for t in wins) / len(wins) if wins else 0
-        avg_loss = sum(t['trade_pnl'] for t in losses) / len(losses) if losses else 0
+        avg_win = float(cash_pnl[win_mask].mean()) if num_wins else 0
+        avg_loss = float(cash_pnl[~win_mask].mean()) if num_losses else 0
 
         profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
 
-        # Calculate max drawdown
-        max_capital = self.initial_capital
-        max_drawdown = 0
-        for log in self.daily_log:
-            max_capital = max(max_capital, log['capital'])
-            drawdown = (max_capital - log['capital']) / max_capital
-            max_drawdown = max(max_drawdown, drawdown)
+        # Max drawdown as a single running-max ufunc over the capital log
+        capital = self._capital_log[:self._num_days]
+        if len(capital):
+            peak = np.maximum.accumulate(np.maximum(capital, self.initial_capital))
+            max_drawdown = float(((peak - capital) / peak).max())
+        else:
+            max_drawdown = 0
 
         return {
             'initial_capital': self.initial_capital,
@@ -480,15 +731,18 @@ class FullBacktester:
             'total_pnl': total_pnl,
             'total_pnl_percent': total_pnl_pct,
             'num_trades': len(self.trades),
-            'num_wins': len(wins),
-            'num_losses': len(losses),
+            'num_wins': num_wins,
+            'num_losses': num_losses,
             'win_rate': win_rate,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
             'profit_factor': profit_factor,
             'max_drawdown': max_drawdown * 100,
             'trades': self.trades,
-            'daily_log': self.daily_log
+            'daily_log': {
+                'date': self._log_dates[:self._num_days],
+                'capital': capital
+            }
         }
 
     def print_report(self, results: Dict[str, Any]) -> None:
@@ -547,16 +801,23 @@ def main():
     # Print results
     backtester.print_report(results)
     
-    # Export to CSV
+    # Export trade log and daily capital log; Parquet keeps the columnar
+    # layout and compresses well, with CSV as fallback when no Parquet
+    # engine (pyarrow/fastparquet) is installed
     if results.get('trades'):
         df = pd.DataFrame(results['trades'])
-        df.to_csv('backtest_results.csv', index=False)
-        print(f"\n💾 Detailed results: backtest_results.csv")
-        
-        # Also export daily capital log
         daily_df = pd.DataFrame(results['daily_log'])
-        daily_df.to_csv('backtest_daily.csv', index=False)
-        print(f"💾 Daily log:        backtest_daily.csv\n")
+
+        try:
+            df.to_parquet('backtest_results.parquet', index=False)
+            daily_df.to_parquet('backtest_daily.parquet', index=False)
+            print(f"\n💾 Detailed results: backtest_results.parquet")
+            print(f"💾 Daily log:        backtest_daily.parquet\n")
+        except ImportError:
+            df.to_csv('backtest_results.csv', index=False)
+            daily_df.to_csv('backtest_daily.csv', index=False)
+            print(f"\n💾 Detailed results: backtest_results.csv")
+            print(f"💾 Daily log:        backtest_daily.csv\n")
 
 
 if __name__ == "__main__":
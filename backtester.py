@@ -3,8 +3,9 @@ Backtesting module.
 Test trading strategies on historical data.
 """
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import date, timedelta, datetime
+import numpy as np
 import pandas as pd
 import os
 from alpaca.data.historical import StockHistoricalDataClient
@@ -17,6 +18,28 @@ from config import AnalysisConfig
 logger = logging.getLogger(__name__)
 
 
+def _find_exit(highs: np.ndarray, lows: np.ndarray,
+               take_profit: float, stop_loss: float) -> Tuple[int, int]:
+    """
+    Find the first bar hitting the take-profit or stop-loss level.
+
+    Returns (index, reason) with reason 0 for take profit and 1 for stop
+    loss, or (-1, -1) when neither level is touched. Take profit wins
+    when both trigger on the same bar. Kept as a standalone numeric
+    kernel over plain arrays; njit-compatible if numba is ever added.
+    """
+    n = len(highs)
+    tp_hits = highs >= take_profit
+    sl_hits = lows <= stop_loss
+    tp_idx = int(tp_hits.argmax()) if tp_hits.any() else n
+    sl_idx = int(sl_hits.argmax()) if sl_hits.any() else n
+    if tp_idx <= sl_idx and tp_idx < n:
+        return tp_idx, 0
+    if sl_idx < n:
+        return sl_idx, 1
+    return -1, -1
+
+
 class Backtester:
     """Backtests the earnings jump strategy on historical data using Alpaca."""
 
@@ -38,9 +61,63 @@ class Backtester:
         else:
             self.alpaca_data = None
 
+    @staticmethod
+    def _bars_to_arrays(ticker_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Extract one ticker's slice of an Alpaca `bars.df` as plain arrays."""
+        df = ticker_df.droplevel('symbol') if 'symbol' in ticker_df.index.names else ticker_df
+        # Naive midnight timestamps keep comparisons at C level; the
+        # simulation itself runs on the raw column arrays
+        index = df.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return {
+            'ts': index.normalize().to_numpy().astype('datetime64[ns]'),
+            'high': df['high'].to_numpy(dtype=np.float64),
+            'low': df['low'].to_numpy(dtype=np.float64),
+            'close': df['close'].to_numpy(dtype=np.float64)
+        }
+
+    def _prefetch_bars(self, test_stocks: List[Dict[str, Any]],
+                       hold_days: int = 5) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Download bars covering every backtest trade in one multi-symbol
+        request, keyed per ticker, so simulate_trade runs purely locally.
+        """
+        if not self.alpaca_data or not test_stocks:
+            return {}
+
+        tickers = sorted({s['ticker'] for s in test_stocks})
+        entry_dates = [s['entry_date'] for s in test_stocks]
+
+        try:
+            request_params = StockBarsRequest(
+                symbol_or_symbols=tickers,
+                timeframe=TimeFrame.Day,
+                start=min(entry_dates) - timedelta(days=5),
+                end=max(entry_dates) + timedelta(days=hold_days + 10),
+                feed='iex'  # Use IEX feed for free tier accounts
+            )
+
+            bars = self.alpaca_data.get_stock_bars(request_params)
+
+            # bars.df is already columnar; split per ticker without any
+            # per-bar Python loop
+            if bars.df.empty:
+                return {}
+
+            return {
+                ticker: self._bars_to_arrays(ticker_df)
+                for ticker, ticker_df in bars.df.groupby(level='symbol')
+            }
+
+        except Exception as e:
+            logger.warning(f"Bar prefetch failed, falling back to per-trade requests: {e}")
+            return {}
+
     def simulate_trade(self, ticker: str, entry_date: date,
                       take_profit_pct: float, stop_loss_pct: float,
-                      hold_days: int = 5) -> Dict[str, Any]:
+                      hold_days: int = 5,
+                      bars: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
         """
         Simulate a single trade using Alpaca historical data.
 
@@ -50,94 +127,85 @@ class Backtester:
             take_profit_pct: Take profit percentage (e.g., 0.10 for 10%)
             stop_loss_pct: Stop loss percentage (e.g., -0.08 for -8%)
             hold_days: Maximum days to hold
+            bars: Prefetched bar arrays for this ticker; skips the network call
 
         Returns:
             Dictionary with trade results
         """
-        if not self.alpaca_data:
+        if bars is None and not self.alpaca_data:
             logger.error("Alpaca data client not initialized")
             return None
-            
+
         try:
-            # Get historical data from Alpaca (using IEX feed for free tier)
-            start_date = entry_date - timedelta(days=5)
-            end_date = entry_date + timedelta(days=hold_days + 10)
+            if bars is None:
+                # Get historical data from Alpaca (using IEX feed for free tier)
+                start_date = entry_date - timedelta(days=5)
+                end_date = entry_date + timedelta(days=hold_days + 10)
+
+                request_params = StockBarsRequest(
+                    symbol_or_symbols=[ticker],
+                    timeframe=TimeFrame.Day,
+                    start=start_date,
+                    end=end_date,
+                    feed='iex'  # Use IEX feed for free tier accounts
+                )
 
-            request_params = StockBarsRequest(
-                symbol_or_symbols=[ticker],
-                timeframe=TimeFrame.Day,
-                start=start_date,
-                end=end_date,
-                feed='iex'  # Use IEX feed for free tier accounts
-            )
-            
-            bars = self.alpaca_data.get_stock_bars(request_params)
-            
-            if ticker not in bars.data or not bars.data[ticker]:
-                logger.warning(f"No data for {ticker} around {entry_date}")
-                return None
+                response = self.alpaca_data.get_stock_bars(request_params)
 
-            # Convert to DataFrame
-            df = pd.DataFrame([{
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume
-            } for bar in bars.data[ticker]])
-            
-            df['date'] = pd.to_datetime(df['timestamp']).dt.date
-            df = df.set_index('date')
-
-            # Find entry price (close on entry date or nearest)
-            if entry_date not in df.index:
-                # Find nearest trading day
-                nearest = [d for d in df.index if d >= entry_date]
-                if not nearest:
-                    logger.warning(f"No trading data on or after {entry_date}")
+                if response.df.empty or ticker not in response.df.index.get_level_values('symbol'):
+                    logger.warning(f"No data for {ticker} around {entry_date}")
                     return None
-                entry_date = nearest[0]
-            
-            entry_price = df.loc[entry_date, 'close']
+
+                bars = self._bars_to_arrays(response.df.xs(ticker, level='symbol'))
+
+            # The whole simulation runs on the parallel column arrays;
+            # no DataFrame is built for a ~15-row trade window
+            ts = bars['ts']
+            highs = bars['high']
+            lows = bars['low']
+            closes = bars['close']
+
+            # Find entry bar (entry date or nearest trading day after it).
+            # The index is sorted, so a binary search beats scanning it.
+            entry_idx = int(np.searchsorted(ts, np.datetime64(entry_date), side='left'))
+            if entry_idx >= len(ts):
+                logger.warning(f"No trading data on or after {entry_date}")
+                return None
+            entry_date = pd.Timestamp(ts[entry_idx]).date()
+
+            entry_price = closes[entry_idx]
 
             # Calculate target prices
             take_profit_price = entry_price * (1 + take_profit_pct)
             stop_loss_price = entry_price * (1 + stop_loss_pct)
 
-            # Get holding period data
-            future_dates = [d for d in df.index if d > entry_date][:hold_days]
-            
-            if not future_dates:
+            # Holding period window
+            window_end = min(entry_idx + 1 + hold_days, len(ts))
+            window_ts = ts[entry_idx + 1:window_end]
+            window_highs = highs[entry_idx + 1:window_end]
+            window_lows = lows[entry_idx + 1:window_end]
+
+            if len(window_ts) == 0:
                 logger.warning(f"No future trading dates available for {ticker} after {entry_date}")
                 return None
 
-            # Simulate each day
-            exit_date = None
-            exit_price = None
-            exit_reason = "Hold period expired"
-
-            for trade_date in future_dates:
-                row = df.loc[trade_date]
-                
-                # Check if take profit hit
-                if row['high'] >= take_profit_price:
-                    exit_date = trade_date
-                    exit_price = take_profit_price
-                    exit_reason = "Take profit hit"
-                    break
-
-                # Check if stop loss hit
-                if row['low'] <= stop_loss_price:
-                    exit_date = trade_date
-                    exit_price = stop_loss_price
-                    exit_reason = "Stop loss hit"
-                    break
-
-            # If neither hit, exit at close of last day
-            if exit_price is None:
-                exit_date = future_dates[-1]
-                exit_price = df.loc[exit_date, 'close']
+            # First take-profit/stop-loss hit via the exit kernel
+            hit_idx, hit_reason = _find_exit(window_highs, window_lows,
+                                             take_profit_price, stop_loss_price)
+
+            if hit_reason == 0:
+                exit_date = pd.Timestamp(window_ts[hit_idx]).date()
+                exit_price = take_profit_price
+                exit_reason = "Take profit hit"
+            elif hit_reason == 1:
+                exit_date = pd.Timestamp(window_ts[hit_idx]).date()
+                exit_price = stop_loss_price
+                exit_reason = "Stop loss hit"
+            else:
+                # Neither hit: exit at close of last day
+                exit_date = pd.Timestamp(window_ts[-1]).date()
+                exit_price = closes[window_end - 1]
+                exit_reason = "Hold period expired"
 
             # Calculate results
             pnl = exit_price - entry_price
@@ -172,12 +240,14 @@ class Backtester:
         Returns:
             Dictionary with backtest results
         """
-        capital = initial_capital
-        trades = []
-
         logger.info(f"Starting backtest with ${initial_capital:.2f}")
         logger.info(f"Testing {len(test_stocks)} trades")
 
+        # One multi-symbol request up front; the per-trade loop then runs
+        # without any network round-trips
+        prefetched = self._prefetch_bars(test_stocks, hold_days=5)
+
+        trades = []
         for stock_data in test_stocks:
             ticker = stock_data['ticker']
             entry_date = stock_data['entry_date']
@@ -190,52 +260,61 @@ class Backtester:
                 entry_date=entry_date,
                 take_profit_pct=avg_gain,
                 stop_loss_pct=avg_drawdown * 1.1,  # 110% of historical drawdown (more risky)
-                hold_days=5
+                hold_days=5,
+                bars=prefetched.get(ticker)
             )
 
             if result:
-                # Calculate position size (using 85% of capital)
-                position_size = capital * 0.85
-                shares = position_size / result['entry_price']
-                trade_pnl = shares * result['pnl']
-                capital += trade_pnl
-
-                result['shares'] = shares
-                result['position_size'] = position_size
-                result['trade_pnl'] = trade_pnl
-                result['capital_after'] = capital
-
                 trades.append(result)
 
-                logger.info(
-                    f"{ticker}: {result['pnl_percent']:+.2f}% "
-                    f"| P&L: ${trade_pnl:+.2f} | Capital: ${capital:.2f}"
-                )
-
         # Calculate statistics
         if not trades:
             logger.warning("No successful trades in backtest")
             return {'error': 'No trades executed'}
 
+        # The capital evolution capital[i+1] = capital[i] * (1 + 0.85 *
+        # pnl_pct[i]) is a cumulative product, so the position sizing,
+        # shares and P&L columns all fall out of one vectorized pass
+        pnl_pcts = np.fromiter((t['pnl_percent'] for t in trades),
+                               dtype=np.float64, count=len(trades)) / 100.0
+        entry_prices = np.fromiter((t['entry_price'] for t in trades),
+                                   dtype=np.float64, count=len(trades))
+
+        caps = initial_capital * np.cumprod(1.0 + 0.85 * pnl_pcts)
+        caps_before = np.concatenate(([initial_capital], caps[:-1]))
+        position_sizes = caps_before * 0.85  # using 85% of capital
+        shares = position_sizes / entry_prices
+        trade_pnls = caps - caps_before
+
+        for trade, position_size, share_count, trade_pnl, capital_after in zip(
+                trades, position_sizes, shares, trade_pnls, caps):
+            trade['shares'] = float(share_count)
+            trade['position_size'] = float(position_size)
+            trade['trade_pnl'] = float(trade_pnl)
+            trade['capital_after'] = float(capital_after)
+
+            logger.info(
+                f"{trade['ticker']}: {trade['pnl_percent']:+.2f}% "
+                f"| P&L: ${trade_pnl:+.2f} | Capital: ${capital_after:.2f}"
+            )
+
+        capital = float(caps[-1])
         total_pnl = capital - initial_capital
         total_pnl_pct = (total_pnl / initial_capital) * 100
 
-        wins = [t for t in trades if t['pnl'] > 0]
-        losses = [t for t in trades if t['pnl'] <= 0]
+        wins_mask = pnl_pcts > 0
+        num_wins = int(wins_mask.sum())
+        num_losses = len(trades) - num_wins
 
-        win_rate = (len(wins) / len(trades)) * 100 if trades else 0
+        win_rate = float(wins_mask.mean()) * 100
 
-        avg_win = sum(t['trade_pnl'] for t in wins) / len(wins) if wins else 0
-        avg_loss = sum(t['trade_pnl'] for t in losses) / len(losses) if losses else 0
+        avg_win = float(trade_pnls[wins_mask].mean()) if num_wins else 0
+        avg_loss = float(trade_pnls[~wins_mask].mean()) if num_losses else 0
 
         profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
 
-        max_capital = initial_capital
-        max_drawdown = 0
-        for trade in trades:
-            max_capital = max(max_capital, trade['capital_after'])
-            drawdown = (max_capital - trade['capital_after']) / max_capital
-            max_drawdown = max(max_drawdown, drawdown)
+        running_max = np.maximum.accumulate(np.maximum(caps, initial_capital))
+        max_drawdown = float(((running_max - caps) / running_max).max())
 
         results = {
             'initial_capital': initial_capital,
@@ -243,8 +322,8 @@ class Backtester:
             'total_pnl': total_pnl,
             'total_pnl_percent': total_pnl_pct,
             'num_trades': len(trades),
-            'num_wins': len(wins),
-            'num_losses': len(losses),
+            'num_wins': num_wins,
+            'num_losses': num_losses,
             'win_rate': win_rate,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
@@ -293,8 +372,15 @@ Max Drawdown:     {results['max_drawdown']:.2f}%
             return False
 
         try:
-            df = pd.DataFrame(self.results)
-            df.to_csv(filename, index=False)
+            try:
+                # Arrow writes the columns directly without materializing
+                # Python string rows; fall back to pandas when absent
+                import pyarrow as pa
+                import pyarrow.csv as pacsv
+                pacsv.write_csv(pa.Table.from_pylist(self.results), filename)
+            except ImportError:
+                df = pd.DataFrame(self.results)
+                df.to_csv(filename, index=False)
             logger.info(f"Results exported to {filename}")
             return True
         except Exception as e:
@@ -2,7 +2,9 @@
 Configuration management module.
 Handles loading and validation of configuration from environment variables.
 """
+import functools
 import os
+from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 from dotenv import load_dotenv
@@ -13,8 +15,19 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Placeholder values from .env.example; a credential matching any of
+# these is treated as unset. One frozenset membership test per field
+# replaces the per-field string literal comparisons.
+PLACEHOLDER_SENTINELS = frozenset({
+    "your_alpaca_api_key_here",
+    "your_alpaca_secret_key_here",
+    "your_finnhub_api_key_here",
+    "your_telegram_bot_token_here",
+    "your_telegram_chat_id_here",
+})
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class AlpacaConfig:
     """Alpaca API configuration."""
     api_key: str
@@ -23,10 +36,10 @@ class AlpacaConfig:
 
     def validate(self) -> bool:
         """Validate Alpaca configuration."""
-        if not self.api_key or self.api_key == "your_alpaca_api_key_here":
+        if not self.api_key or self.api_key in PLACEHOLDER_SENTINELS:
             logger.error("ALPACA_API_KEY not set properly")
             return False
-        if not self.secret_key or self.secret_key == "your_alpaca_secret_key_here":
+        if not self.secret_key or self.secret_key in PLACEHOLDER_SENTINELS:
             logger.error("ALPACA_SECRET_KEY not set properly")
             return False
         if not self.base_url:
@@ -35,20 +48,20 @@ class AlpacaConfig:
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FinnhubConfig:
     """Finnhub API configuration."""
     api_key: str
 
     def validate(self) -> bool:
         """Validate Finnhub configuration."""
-        if not self.api_key or self.api_key == "your_finnhub_api_key_here":
+        if not self.api_key or self.api_key in PLACEHOLDER_SENTINELS:
             logger.error("FINNHUB_API_KEY not set properly")
             return False
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TelegramConfig:
     """Telegram bot configuration."""
     bot_token: str
@@ -56,16 +69,16 @@ class TelegramConfig:
 
     def validate(self) -> bool:
         """Validate Telegram configuration."""
-        if not self.bot_token or self.bot_token == "your_telegram_bot_token_here":
+        if not self.bot_token or self.bot_token in PLACEHOLDER_SENTINELS:
             logger.error("TELEGRAM_BOT_TOKEN not set properly")
             return False
-        if not self.chat_id or self.chat_id == "your_telegram_chat_id_here":
+        if not self.chat_id or self.chat_id in PLACEHOLDER_SENTINELS:
             logger.error("TELEGRAM_CHAT_ID not set properly")
             return False
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskConfig:
     """Risk management configuration."""
     max_position_size_percent: float
@@ -98,7 +111,7 @@ class RiskConfig:
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisConfig:
     """Analysis configuration."""
     history_years: int
@@ -117,7 +130,7 @@ class AnalysisConfig:
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BotConfig:
     """Main bot configuration."""
     analysis_hour: int
@@ -202,37 +215,38 @@ class Config:
 config = Config()
 
 
-def load_tradable_stocks(filename: str = "stocks.txt") -> set:
+@functools.lru_cache(maxsize=4)
+def load_tradable_stocks(filename: str = "stocks.txt") -> frozenset:
     """
-    Load tradable stock symbols from file.
-    
+    Load tradable stock symbols from file. Cached per filename, so
+    repeated calls share one frozenset instead of re-reading the file.
+
     Args:
         filename: Path to the stocks file (default: stocks.txt)
-    
+
     Returns:
-        Set of stock symbols
+        Frozenset of upper-cased stock symbols (O(1) membership tests)
     """
     try:
-        stocks = set()
-        with open(filename, 'r') as f:
-            for line in f:
-                # Skip comments and empty lines
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    stocks.add(line)
-        
+        # One read of the whole file, then skip comments and empty lines
+        stocks = frozenset(
+            line.upper()
+            for line in (raw.strip() for raw in Path(filename).read_text().splitlines())
+            if line and not line.startswith('#')
+        )
+
         logger.info(f"Loaded {len(stocks)} tradable stocks from {filename}")
         return stocks
-    
+
     except FileNotFoundError:
         logger.warning(f"Stock file {filename} not found. Run fetch_alpaca_stocks.py first.")
-        return set()
-    
+        return frozenset()
+
     except Exception as e:
         logger.error(f"Error loading stocks from {filename}: {e}")
-        return set()
+        return frozenset()
 
 
 # Load tradable stocks on module import
-TRADABLE_STOCKS = load_tradable_stocks()
+TRADABLE_STOCKS: frozenset = load_tradable_stocks()
 
@@ -1,10 +1,12 @@
 """
 Database module for trade logging and persistence.
 """
+import atexit
 import sqlite3
 import logging
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -16,13 +18,34 @@ class Database:
     def __init__(self, db_path: str):
         """Initialize database connection."""
         self.db_path = db_path
+        self._local = threading.local()
         self.init_database()
+        # Persistent connections are never closed per operation; make
+        # sure the main thread's one is flushed at interpreter exit
+        atexit.register(self.close)
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Context manager for database connections.
+        Each thread reuses one persistent connection instead of paying
+        connect/close overhead on every operation.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers run alongside the writer and NORMAL sync
+            # drops the full fsync per commit, which dominates this
+            # small-transaction logging workload; the rest keep temp
+            # structures and hot pages in memory
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            self._local.conn = conn
+
         try:
             yield conn
             conn.commit()
@@ -30,8 +53,13 @@ class Database:
             conn.rollback()
             logger.error(f"Database error: {e}")
             raise
-        finally:
+
+    def close(self) -> None:
+        """Close this thread's connection, if any."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
 
     def init_database(self) -> None:
         """Initialize database schema."""
@@ -109,6 +137,34 @@ class Database:
                 )
             """)
 
+            # Indexes for the hot reporting queries: DATE(exit_time) is an
+            # expression index so the DATE() wrapper in WHERE clauses can
+            # still use it; (status, pnl) covers the best/worst trade sorts.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_exit_date
+                ON trades(DATE(exit_time), status)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_status_pnl
+                ON trades(status, pnl DESC)
+            """)
+            # Partial index over just the closed trades for the rolling
+            # statistics range scans; ticker+status covers open-position
+            # lookups and exit updates; analysis_date covers the
+            # analysis-history queries.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_closed_exit_time
+                ON trades(exit_time) WHERE status = 'closed'
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_ticker_status
+                ON trades(ticker, status)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_analysis_date
+                ON analysis_results(analysis_date)
+            """)
+
             logger.info("Database initialized successfully")
 
     def log_trade_entry(self, ticker: str, entry_price: float, quantity: float,
@@ -161,6 +217,26 @@ class Database:
             """, (ticker, analysis_date, earnings_date, score,
                   avg_gain, avg_drawdown, frequency, selected))
 
+    def log_analysis_results_bulk(self, rows: List[Tuple]) -> None:
+        """
+        Log many analysis results in one transaction.
+
+        Args:
+            rows: Tuples of (ticker, analysis_date, earnings_date, score,
+                  avg_gain, avg_drawdown, frequency, selected)
+        """
+        if not rows:
+            return
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO analysis_results (
+                    ticker, analysis_date, earnings_date, score,
+                    avg_gain, avg_drawdown, frequency, selected
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            logger.info(f"Logged {len(rows)} analysis results")
+
     def log_account_snapshot(self, equity: float, cash: float,
                             buying_power: float, portfolio_value: float) -> None:
         """Log account snapshot."""
@@ -183,11 +259,13 @@ class Database:
         """Get total P&L for a specific date."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Range predicate instead of DATE(exit_time) so the exit_time
+            # indexes stay usable
             cursor.execute("""
                 SELECT SUM(pnl) as total_pnl
                 FROM trades
-                WHERE DATE(exit_time) = ?
-            """, (date,))
+                WHERE exit_time >= ? AND exit_time < date(?, '+1 day')
+            """, (date, date))
             result = cursor.fetchone()
             return result['total_pnl'] if result['total_pnl'] else 0.0
 
@@ -204,7 +282,9 @@ class Database:
                     AVG(pnl) as avg_pnl,
                     MAX(pnl) as max_win,
                     MIN(pnl) as max_loss,
-                    AVG(pnl_percent) as avg_pnl_percent
+                    AVG(pnl_percent) as avg_pnl_percent,
+                    SUM(CASE WHEN pnl > 0 THEN pnl ELSE 0 END) as gross_profit,
+                    SUM(CASE WHEN pnl < 0 THEN -pnl ELSE 0 END) as gross_loss
                 FROM trades
                 WHERE status = 'closed'
                 AND exit_time >= datetime('now', '-' || ? || ' days')
@@ -238,18 +318,29 @@ class Database:
             cursor.execute("""
                 SELECT
                     COUNT(*) as num_trades,
-                    SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as num_wins,
-                    SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END) as num_losses
+                    COUNT(*) FILTER (WHERE pnl > 0) as num_wins,
+                    COUNT(*) FILTER (WHERE pnl < 0) as num_losses
                 FROM trades
-                WHERE DATE(exit_time) = ? AND status = 'closed'
-            """, (date,))
+                WHERE exit_time >= ? AND exit_time < date(?, '+1 day')
+                AND status = 'closed'
+            """, (date, date))
             trade_stats = cursor.fetchone()
 
+            # Upsert instead of INSERT OR REPLACE: updates the existing
+            # row in place rather than deleting and re-inserting it.
             cursor.execute("""
-                INSERT OR REPLACE INTO daily_performance (
+                INSERT INTO daily_performance (
                     date, starting_balance, ending_balance, pnl, pnl_percent,
                     num_trades, num_wins, num_losses
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(date) DO UPDATE SET
+                    starting_balance = excluded.starting_balance,
+                    ending_balance = excluded.ending_balance,
+                    pnl = excluded.pnl,
+                    pnl_percent = excluded.pnl_percent,
+                    num_trades = excluded.num_trades,
+                    num_wins = excluded.num_wins,
+                    num_losses = excluded.num_losses
             """, (date, starting_balance, ending_balance, pnl, pnl_percent,
                   trade_stats['num_trades'] or 0,
                   trade_stats['num_wins'] or 0,
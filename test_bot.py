@@ -150,7 +150,7 @@ class TestDatabase:
 class TestRiskManager:
     """Test risk management module."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def risk_config(self):
         """Create test risk config."""
         return RiskConfig(
@@ -162,11 +162,15 @@ class TestRiskManager:
             min_daily_volume=1000000
         )
 
+    @pytest.fixture(scope="module")
+    def risk_db(self):
+        """One shared database for the class; these tests never write to it."""
+        return Database(':memory:')
+
     @pytest.fixture
-    def risk_manager(self, risk_config):
-        """Create test risk manager."""
-        db = Database(':memory:')
-        return RiskManager(risk_config, db)
+    def risk_manager(self, risk_config, risk_db):
+        """Create test risk manager (fresh state, shared database)."""
+        return RiskManager(risk_config, risk_db)
 
     def test_daily_loss_limit(self, risk_manager):
         """Test daily loss limit checking."""
@@ -245,9 +249,9 @@ class TestRiskManager:
 class TestAnalytics:
     """Test analytics module."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def db_with_trades(self):
-        """Create database with sample trades."""
+        """Create database with sample trades, shared read-only by the class."""
         db = Database(':memory:')
 
         # Add winning trade
@@ -2,9 +2,18 @@
 Trading execution module.
 Handles order placement and position monitoring.
 """
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, Tuple, List
 import alpaca_trade_api as tradeapi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from risk_manager import RiskManager
 from database import Database
@@ -12,6 +21,56 @@ from notifier import TelegramNotifier
 
 logger = logging.getLogger(__name__)
 
+# Burst callers (batch placement, the monitor loop) re-ask for the same
+# account and clock state within milliseconds; a sub-second cache
+# collapses those into one REST hit without serving meaningfully stale data
+API_CACHE_TTL_SECONDS = 0.5
+
+# How long one list_positions() snapshot may serve per-ticker lookups
+POSITIONS_SNAPSHOT_TTL_SECONDS = 5.0
+
+
+@dataclass(slots=True, frozen=True)
+class Position:
+    """Snapshot of one open position; slotted so large portfolios stay light."""
+    ticker: str
+    qty: float
+    entry_price: float
+    current_price: float
+    market_value: float
+    unrealized_pl: float
+    unrealized_plpc: float
+
+
+def _to_position(pos) -> Position:
+    """Convert an Alpaca position entity into our slotted snapshot."""
+    return Position(
+        ticker=pos.symbol,
+        qty=float(pos.qty),
+        entry_price=float(pos.avg_entry_price),
+        current_price=float(pos.current_price),
+        market_value=float(pos.market_value),
+        unrealized_pl=float(pos.unrealized_pl),
+        unrealized_plpc=float(pos.unrealized_plpc)
+    )
+
+
+def _ttl_cache(method):
+    """Cache a no-argument API method's result on the instance briefly."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        hit = self._api_cache.get(name)
+        now = time.monotonic()
+        if hit is not None and now - hit[0] < API_CACHE_TTL_SECONDS:
+            return hit[1]
+        value = method(self)
+        self._api_cache[name] = (now, value)
+        return value
+
+    return wrapper
+
 
 class Trader:
     """Handles trade execution and position management."""
@@ -24,6 +83,58 @@ class Trader:
         self.db = database
         self.notifier = notifier
 
+        # Replace the SDK's default session with a pooled keep-alive one
+        # so order placement pays only the RTT, not a TLS handshake per
+        # call. Auth headers are built per-request, so this is safe.
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+        self.api._session = session
+
+        # Short-TTL cache for the read-only API snapshots; see _ttl_cache
+        self._api_cache: Dict[str, Tuple[float, Any]] = {}
+
+        # Positions indexed by ticker from the last list_positions() call
+        self._positions_by_ticker: Dict[str, Position] = {}
+        self._positions_asof = float('-inf')
+
+        # Shared pool for overlapping independent REST round-trips;
+        # living on the instance avoids per-order thread churn
+        self._pool = ThreadPoolExecutor(max_workers=8)
+
+        # Last fetched (is_open, next_open, next_close); lets
+        # is_market_open answer locally until the next session boundary
+        self._clock_state: Optional[Tuple[bool, Any, Any]] = None
+
+        # Daemon thread running the trade_updates stream, once started
+        self._stream_thread: Optional[threading.Thread] = None
+
+        # Fixed half of the market-sell payload, built once; exits during
+        # a stop-loss cascade only fill in symbol and quantity
+        self._sell_template = {'side': 'sell', 'type': 'market',
+                               'time_in_force': 'day'}
+
+    def _invalidate_api_cache(self, *names: str) -> None:
+        """Drop cached snapshots after an order changes account state."""
+        for name in names:
+            self._api_cache.pop(name, None)
+
+    def refresh_state(self) -> None:
+        """
+        Prefetch the account snapshot and market clock in one concurrent
+        burst. Called at the top of a loop tick, the two round-trips
+        overlap instead of running back to back and the reads that
+        follow (get_account_info, is_market_open) are served from the
+        primed caches.
+        """
+        account_future = self._pool.submit(self.get_account_info)
+        self.get_market_status()
+        account_future.result()
+
+    @_ttl_cache
     def get_account_info(self) -> Dict[str, float]:
         """Get current account information."""
         try:
@@ -47,17 +158,34 @@ class Trader:
             logger.error(f"Error getting price for {ticker}: {e}")
             return None
 
-    def place_bracket_order(self, stock_data: Dict[str, Any]) -> Optional[str]:
+    def place_bracket_order(self, stock_data: Dict[str, Any],
+                            account_info: Optional[Dict[str, float]] = None) -> Optional[str]:
         """
         Place a bracket order (market entry with take profit and stop loss).
-        Returns ticker symbol if successful, None otherwise.
+        Accepts pre-fetched account info so batch callers skip the
+        per-ticker round-trip. Returns ticker symbol if successful,
+        None otherwise.
         """
         ticker = stock_data['ticker']
         logger.info(f"=== Attempting to place order for {ticker} ===")
 
         try:
-            # Get account info
-            account_info = self.get_account_info()
+            # Purely local gate first: a signal the risk manager already
+            # knows it must reject shouldn't cost any round-trip
+            can_trade, reason = self.risk.cheap_pretrade_gate()
+            if not can_trade:
+                logger.warning(f"Risk check failed: {reason}")
+                self.notifier.notify_risk_limit_hit("Trading Halted", 0)
+                return None
+
+            # The latest trade and the account snapshot are independent
+            # round-trips; fetch the price concurrently while the account
+            # info and risk gate run, saving one RTT per order
+            price_future = self._pool.submit(self.get_current_price, ticker)
+
+            # Get account info unless the caller already has it
+            if account_info is None:
+                account_info = self.get_account_info()
             if not account_info:
                 logger.error("Could not get account information")
                 return None
@@ -71,8 +199,8 @@ class Trader:
                 self.notifier.notify_risk_limit_hit("Trading Halted", 0)
                 return None
 
-            # Get current price
-            current_price = self.get_current_price(ticker)
+            # Collect the concurrently fetched price
+            current_price = price_future.result()
             if not current_price:
                 logger.error(f"Could not get price for {ticker}")
                 return None
@@ -107,13 +235,27 @@ class Trader:
                 stock_data['avg_gain']
             )
 
-            # Log order details
-            logger.info(f"Order details for {ticker}:")
-            logger.info(f"  Quantity: {quantity:.4f}")
-            logger.info(f"  Entry Price: ~${current_price:.2f}")
-            logger.info(f"  Capital: ${capital_used:.2f}")
-            logger.info(f"  Take Profit: ${take_profit_price:.2f} (+{stock_data['avg_gain']:.2%})")
-            logger.info(f"  Stop Loss: ${stop_loss_price:.2f}")
+            # Log order details: one lazily-formatted record instead of
+            # six separate format-and-emit cycles
+            logger.info(
+                "Order details for %s:\n"
+                "  Quantity: %.4f\n"
+                "  Entry Price: ~$%.2f\n"
+                "  Capital: $%.2f\n"
+                "  Take Profit: $%.2f (+%.2f%%)\n"
+                "  Stop Loss: $%.2f",
+                ticker, quantity, current_price, capital_used,
+                take_profit_price, stock_data['avg_gain'] * 100,
+                stop_loss_price
+            )
+
+            # Snap to the broker's increments so the first submission
+            # sticks: prices to cents (the epsilon keeps half-cent values
+            # from rounding down), quantity to Alpaca's six fractional
+            # decimals
+            take_profit_price = round(take_profit_price + 1e-9, 2)
+            stop_loss_price = round(stop_loss_price + 1e-9, 2)
+            quantity = round(quantity, 6)
 
             # Submit bracket order
             order = self.api.submit_order(
@@ -127,8 +269,11 @@ class Trader:
                 stop_loss={'stop_price': stop_loss_price}
             )
 
-            logger.info(f"✅ Bracket order submitted successfully for {ticker}")
-            logger.info(f"   Order ID: {order.id}")
+            logger.info("✅ Bracket order submitted successfully for %s\n"
+                        "   Order ID: %s", ticker, order.id)
+
+            # The fill changes buying power and positions; drop stale snapshots
+            self._invalidate_api_cache('get_account_info', 'get_all_positions')
 
             # Log to database
             self.db.log_trade_entry(
@@ -161,71 +306,146 @@ class Trader:
             self.notifier.notify_error(f"Order placement failed for {ticker}: {str(e)}")
             return None
 
-    def get_position(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def place_bracket_orders(self, stock_data_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Place bracket orders for several candidates in one pass.
+        Alpaca has no batch order endpoint, so this shares one account
+        snapshot and one risk gate across the loop instead of paying
+        both per ticker. Returns the tickers that were submitted.
+        """
+        if not stock_data_list:
+            return []
+
+        account_info = self.get_account_info()
+        if not account_info:
+            logger.error("Could not get account information")
+            return []
+
+        can_trade, reason = self.risk.can_trade(account_info['equity'])
+        if not can_trade:
+            logger.warning(f"Risk check failed: {reason}")
+            self.notifier.notify_risk_limit_hit("Trading Halted", 0)
+            return []
+
+        placed = []
+        for stock_data in stock_data_list:
+            ticker = self.place_bracket_order(stock_data, account_info=account_info)
+            if ticker:
+                placed.append(ticker)
+
+        return placed
+
+    def get_position(self, ticker: str) -> Optional[Position]:
         """Get current position for a ticker."""
         try:
-            position = self.api.get_position(ticker)
-            return {
-                'ticker': ticker,
-                'qty': float(position.qty),
-                'entry_price': float(position.avg_entry_price),
-                'current_price': float(position.current_price),
-                'market_value': float(position.market_value),
-                'unrealized_pl': float(position.unrealized_pl),
-                'unrealized_plpc': float(position.unrealized_plpc)
-            }
+            return _to_position(self.api.get_position(ticker))
         except Exception as e:
             # Position doesn't exist
             return None
 
-    def monitor_position(self, ticker: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    def start_trade_updates_stream(self) -> None:
+        """
+        Subscribe to Alpaca's trade_updates stream on a daemon thread.
+        Fills and cancels then invalidate the cached position state the
+        moment they happen, so monitoring loops see exits at push latency
+        instead of waiting out their polling interval.
+        """
+        if self._stream_thread is not None:
+            return
+
+        def _run() -> None:
+            from alpaca_trade_api.stream import Stream
+            try:
+                stream = Stream(self.api._key_id, self.api._secret_key,
+                                base_url=self.api._base_url)
+                stream.subscribe_trade_updates(self._on_trade_update)
+                stream.run()
+            except Exception as e:
+                # Polling still works without the stream; don't take the
+                # bot down over it
+                logger.error(f"Trade updates stream stopped: {e}")
+
+        self._stream_thread = threading.Thread(
+            target=_run, daemon=True, name='trade-updates'
+        )
+        self._stream_thread.start()
+
+    async def _on_trade_update(self, update) -> None:
+        """Handle a pushed order event by dropping stale cached state."""
+        event = update.event
+        if event in ('fill', 'partial_fill', 'canceled', 'expired', 'rejected'):
+            # Positions and buying power just changed; force the next
+            # check to refresh instead of trusting the snapshot
+            self._positions_asof = float('-inf')
+            self._invalidate_api_cache('get_account_info', 'get_all_positions')
+            logger.info("Trade update: %s %s", event, update.order.get('symbol'))
+
+    def refresh_positions_snapshot(self) -> Dict[str, Position]:
+        """
+        Fetch every open position in one list_positions() call and index
+        them by ticker. Monitoring loops call this once per tick so the
+        per-ticker checks become dict lookups instead of REST round-trips.
+        """
+        try:
+            positions = self.api.list_positions()
+            self._positions_by_ticker = {
+                pos.symbol: _to_position(pos) for pos in positions
+            }
+            self._positions_asof = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error refreshing positions snapshot: {e}")
+
+        return self._positions_by_ticker
+
+    def monitor_position(self, ticker: str) -> Tuple[bool, Optional[Position]]:
         """
         Check if position still exists.
         Returns (position_open, position_info)
         """
+        # Serve from a fresh snapshot when we have one; a miss is
+        # ambiguous (closed vs stale), so only hits skip the REST call
+        if time.monotonic() - self._positions_asof < POSITIONS_SNAPSHOT_TTL_SECONDS:
+            position = self._positions_by_ticker.get(ticker)
+            if position is not None:
+                return True, position
+
         position = self.get_position(ticker)
         return (position is not None, position)
 
-    def get_all_positions(self) -> List[Dict[str, Any]]:
+    @_ttl_cache
+    def get_all_positions(self) -> List[Position]:
         """Get all open positions."""
         try:
-            positions = self.api.list_positions()
-            return [{
-                'ticker': pos.symbol,
-                'qty': float(pos.qty),
-                'entry_price': float(pos.avg_entry_price),
-                'current_price': float(pos.current_price),
-                'market_value': float(pos.market_value),
-                'unrealized_pl': float(pos.unrealized_pl),
-                'unrealized_plpc': float(pos.unrealized_plpc)
-            } for pos in positions]
+            return [_to_position(pos) for pos in self.api.list_positions()]
         except Exception as e:
             logger.error(f"Error getting positions: {e}")
             return []
 
-    def close_position(self, ticker: str, reason: str = "Manual close") -> bool:
-        """Manually close a position."""
+    def close_position(self, ticker: str, reason: str = "Manual close",
+                       position: Optional[Position] = None) -> bool:
+        """
+        Manually close a position.
+        Callers that already hold the Position (e.g. from a monitor
+        loop) can pass it in to skip the extra lookup before the sell.
+        """
         try:
-            position = self.get_position(ticker)
+            if position is None:
+                position = self.get_position(ticker)
             if not position:
                 logger.warning(f"No position found for {ticker}")
                 return False
 
-            qty = position['qty']
-            self.api.submit_order(
-                symbol=ticker,
-                qty=qty,
-                side='sell',
-                type='market',
-                time_in_force='day'
-            )
+            qty = round(position.qty, 6)
+            payload = {**self._sell_template, 'symbol': ticker, 'qty': qty}
+            self.api.submit_order(**payload)
 
             logger.info(f"Position closed for {ticker}: {reason}")
+            self._invalidate_api_cache('get_account_info', 'get_all_positions')
 
             # Calculate P&L
-            exit_price = position['current_price']
-            pnl = position['unrealized_pl']
-            pnl_percent = position['unrealized_plpc'] * 100
+            exit_price = position.current_price
+            pnl = position.unrealized_pl
+            pnl_percent = position.unrealized_plpc * 100
 
             # Log to database
             self.db.log_trade_exit(
@@ -251,18 +471,27 @@ class Trader:
             return False
 
     def is_market_open(self) -> bool:
-        """Check if market is currently open."""
-        try:
-            clock = self.api.get_clock()
-            return clock.is_open
-        except Exception as e:
-            logger.error(f"Error checking market status: {e}")
-            return False
+        """
+        Check if market is currently open.
+        The session state only flips at next_open/next_close, so between
+        those boundaries this answers from the last clock fetch without
+        touching the API.
+        """
+        if self._clock_state is not None:
+            is_open, next_open, next_close = self._clock_state
+            boundary = next_close if is_open else next_open
+            if datetime.now(timezone.utc) < boundary:
+                return is_open
+
+        # Past the boundary (or never fetched) - refresh the clock
+        return self.get_market_status().get('is_open', False)
 
+    @_ttl_cache
     def get_market_status(self) -> Dict[str, Any]:
         """Get detailed market status."""
         try:
             clock = self.api.get_clock()
+            self._clock_state = (clock.is_open, clock.next_open, clock.next_close)
             return {
                 'is_open': clock.is_open,
                 'next_open': clock.next_open,
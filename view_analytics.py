@@ -5,137 +5,126 @@ Run this script to see your trading statistics.
 Usage:
     python view_analytics.py
 """
+import sys
+
 from database import Database
 from analytics import Analytics
 from config import config
 
+# Table row templates, parsed once instead of once per row
+TICKER_ROW_FMT = ("{ticker:<8} {num_trades:<8} {wins:<6} {win_rate:<7.1f}% "
+                  "${total_pnl:<11,.2f} ${avg_pnl:,.2f}")
+TRADE_ROW_FMT = "{ticker:<8} {entry:<12} {exit:<12} {pnl:<12} {pnl_pct:<10} {status}"
+
 
 def main():
     """Display trading analytics."""
-    print("=" * 60)
-    print("TRADING BOT ANALYTICS")
-    print("=" * 60)
-    print()
+    # Build the whole report in memory and write it once; on piped or
+    # redirected stdout this is one syscall instead of one per line
+    out = []
+    out += ["=" * 60, "TRADING BOT ANALYTICS", "=" * 60, ""]
 
     # Initialize database and analytics
     db = Database(config.bot.database_path)
     analytics = Analytics(db)
 
+    # One call gathers every section's data on a single connection
+    snapshot = analytics.get_dashboard_snapshot(days=30, limit=10)
+
     # Performance Summary (last 30 days)
-    print("📊 PERFORMANCE SUMMARY (Last 30 Days)")
-    print("-" * 60)
-    summary = analytics.get_performance_summary(days=30)
+    out += ["📊 PERFORMANCE SUMMARY (Last 30 Days)", "-" * 60]
+    summary = snapshot['summary']
 
     if summary.get('total_trades', 0) > 0:
-        print(f"Total Trades:      {summary['total_trades']}")
-        print(f"Wins:              {summary['winning_trades']}")
-        print(f"Losses:            {summary['losing_trades']}")
-        print(f"Win Rate:          {summary['win_rate']:.1f}%")
-        print()
-        print(f"Total P&L:         ${summary['total_pnl']:,.2f}")
-        print(f"Average P&L:       ${summary['avg_pnl']:,.2f}")
-        print(f"Avg P&L %:         {summary['avg_pnl_percent']:.2f}%")
-        print()
-        print(f"Best Win:          ${summary['max_win']:,.2f}")
-        print(f"Worst Loss:        ${summary['max_loss']:,.2f}")
-        print(f"Profit Factor:     {summary['profit_factor']:.2f}")
+        out += [
+            f"Total Trades:      {summary['total_trades']}",
+            f"Wins:              {summary['winning_trades']}",
+            f"Losses:            {summary['losing_trades']}",
+            f"Win Rate:          {summary['win_rate']:.1f}%",
+            "",
+            f"Total P&L:         ${summary['total_pnl']:,.2f}",
+            f"Average P&L:       ${summary['avg_pnl']:,.2f}",
+            f"Avg P&L %:         {summary['avg_pnl_percent']:.2f}%",
+            "",
+            f"Best Win:          ${summary['max_win']:,.2f}",
+            f"Worst Loss:        ${summary['max_loss']:,.2f}",
+            f"Profit Factor:     {summary['profit_factor']:.2f}",
+        ]
     else:
-        print("No trades recorded yet.")
+        out.append("No trades recorded yet.")
 
-    print()
-    print("-" * 60)
-    print()
+    out += ["", "-" * 60, ""]
 
     # Best and Worst Trades
-    print("🏆 BEST AND WORST TRADES")
-    print("-" * 60)
-    trades = analytics.get_best_and_worst_trades(limit=3)
+    out += ["🏆 BEST AND WORST TRADES", "-" * 60]
+    trades = snapshot['best_worst']
 
     if trades['best']:
-        print("\nBest Trades:")
+        out.append("\nBest Trades:")
         for i, trade in enumerate(trades['best'], 1):
-            print(f"{i}. {trade['ticker']}: ${trade['pnl']:+,.2f} ({trade['pnl_percent']:+.2f}%)")
+            out.append(f"{i}. {trade['ticker']}: ${trade['pnl']:+,.2f} ({trade['pnl_percent']:+.2f}%)")
 
     if trades['worst']:
-        print("\nWorst Trades:")
+        out.append("\nWorst Trades:")
         for i, trade in enumerate(trades['worst'], 1):
-            print(f"{i}. {trade['ticker']}: ${trade['pnl']:+,.2f} ({trade['pnl_percent']:+.2f}%)")
+            out.append(f"{i}. {trade['ticker']}: ${trade['pnl']:+,.2f} ({trade['pnl_percent']:+.2f}%)")
 
-    print()
-    print("-" * 60)
-    print()
+    out += ["", "-" * 60, ""]
 
     # Performance by Ticker
-    print("📈 PERFORMANCE BY TICKER")
-    print("-" * 60)
-    ticker_perf = analytics.get_ticker_performance()
+    out += ["📈 PERFORMANCE BY TICKER", "-" * 60]
+    ticker_perf = snapshot['ticker_perf']
 
     if ticker_perf:
-        print(f"\n{'Ticker':<8} {'Trades':<8} {'Wins':<6} {'Win%':<8} {'Total P&L':<12} {'Avg P&L'}")
-        print("-" * 60)
-        for perf in ticker_perf[:10]:  # Top 10
-            print(
-                f"{perf['ticker']:<8} "
-                f"{perf['num_trades']:<8} "
-                f"{perf['wins']:<6} "
-                f"{perf['win_rate']:<7.1f}% "
-                f"${perf['total_pnl']:<11,.2f} "
-                f"${perf['avg_pnl']:,.2f}"
-            )
+        out.append(f"\n{'Ticker':<8} {'Trades':<8} {'Wins':<6} {'Win%':<8} {'Total P&L':<12} {'Avg P&L'}")
+        out.append("-" * 60)
+        out += [TICKER_ROW_FMT.format(**perf) for perf in ticker_perf[:10]]  # Top 10
     else:
-        print("No ticker data available.")
+        out.append("No ticker data available.")
 
-    print()
-    print("-" * 60)
-    print()
+    out += ["", "-" * 60, ""]
 
     # Monthly Summary
-    print("📅 CURRENT MONTH SUMMARY")
-    print("-" * 60)
-    monthly = analytics.get_monthly_summary()
+    out += ["📅 CURRENT MONTH SUMMARY", "-" * 60]
+    monthly = snapshot['monthly']
 
     if monthly.get('total_trades', 0) > 0:
-        print(f"Total Trades:      {monthly['total_trades']}")
-        print(f"Wins:              {monthly['wins']}")
-        print(f"Win Rate:          {monthly['win_rate']:.1f}%")
-        print(f"Total P&L:         ${monthly['total_pnl']:,.2f}")
-        print(f"Average P&L:       ${monthly['avg_pnl']:,.2f}")
+        out += [
+            f"Total Trades:      {monthly['total_trades']}",
+            f"Wins:              {monthly['wins']}",
+            f"Win Rate:          {monthly['win_rate']:.1f}%",
+            f"Total P&L:         ${monthly['total_pnl']:,.2f}",
+            f"Average P&L:       ${monthly['avg_pnl']:,.2f}",
+        ]
     else:
-        print("No trades this month.")
+        out.append("No trades this month.")
 
-    print()
-    print("=" * 60)
-    print()
+    out += ["", "=" * 60, ""]
 
     # All Trades
-    print("📋 RECENT TRADES (Last 10)")
-    print("-" * 60)
-    all_trades = db.get_all_trades(limit=10)
+    out += ["📋 RECENT TRADES (Last 10)", "-" * 60]
+    all_trades = snapshot['recent']
 
     if all_trades:
-        print(f"\n{'Ticker':<8} {'Entry':<12} {'Exit':<12} {'P&L':<12} {'P&L %':<10} {'Status'}")
-        print("-" * 60)
+        out.append(f"\n{'Ticker':<8} {'Entry':<12} {'Exit':<12} {'P&L':<12} {'P&L %':<10} {'Status'}")
+        out.append("-" * 60)
         for trade in all_trades:
-            entry_str = f"${trade['entry_price']:.2f}"
-            exit_str = f"${trade['exit_price']:.2f}" if trade['exit_price'] else "Open"
-            pnl_str = f"${trade['pnl']:.2f}" if trade['pnl'] else "-"
-            pnl_pct_str = f"{trade['pnl_percent']:+.2f}%" if trade['pnl_percent'] else "-"
-
-            print(
-                f"{trade['ticker']:<8} "
-                f"{entry_str:<12} "
-                f"{exit_str:<12} "
-                f"{pnl_str:<12} "
-                f"{pnl_pct_str:<10} "
-                f"{trade['status']}"
-            )
+            out.append(TRADE_ROW_FMT.format(
+                ticker=trade['ticker'],
+                entry=f"${trade['entry_price']:.2f}",
+                exit=f"${trade['exit_price']:.2f}" if trade['exit_price'] else "Open",
+                pnl=f"${trade['pnl']:.2f}" if trade['pnl'] else "-",
+                pnl_pct=f"{trade['pnl_percent']:+.2f}%" if trade['pnl_percent'] else "-",
+                status=trade['status']
+            ))
     else:
-        print("No trades recorded.")
+        out.append("No trades recorded.")
 
-    print()
-    print("=" * 60)
+    out += ["", "=" * 60]
+
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
     main()
-